@@ -101,6 +101,8 @@ if not validate_bot_token(BOT_TOKEN):
 # === ADMIN ===
 ADMIN_IDS_STR = os.getenv("ADMIN_IDS", "")
 ADMIN_IDS = parse_admin_ids(ADMIN_IDS_STR)  # ✅ Safe parsing with validation
+# Для проверок "user_id in ...": O(1) вместо прохода по списку на каждый callback
+ADMIN_IDS_SET = frozenset(ADMIN_IDS)
 
 MAX_ADMIN_ADDITIONS_PER_HOUR = int(os.getenv("MAX_ADMIN_ADDITIONS_PER_HOUR", "3"))
 
@@ -150,6 +152,10 @@ DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "10"))
 DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30.0"))
 DB_COMMAND_TIMEOUT = float(os.getenv("DB_COMMAND_TIMEOUT", "60.0"))
 
+# ✅ asyncpg statement cache (per connection): повторные запросы без parse/plan
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "1024"))
+DB_MAX_CACHEABLE_STATEMENT_SIZE = int(os.getenv("DB_MAX_CACHEABLE_STATEMENT_SIZE", "65536"))
+
 # === DATABASE RETRY LOGIC ===
 DB_MAX_RETRIES = int(os.getenv("DB_MAX_RETRIES", "3"))
 DB_RETRY_DELAY = float(os.getenv("DB_RETRY_DELAY", "0.5"))
@@ -15,6 +15,10 @@ Examples:
     ...     booking_id
     ... )
     
+    >>> # Потоковое чтение без материализации всего результата
+    >>> async for row in db_adapter.iterate("SELECT * FROM bookings"):
+    ...     process(row)
+    
     >>> # Транзакции
     >>> async with db_adapter.acquire() as conn:
     ...     async with conn.transaction():
@@ -23,13 +27,17 @@ Examples:
 """
 
 import logging
+import re
 from contextlib import asynccontextmanager
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Set
 
 import asyncpg
 
 logger = logging.getLogger(__name__)
 
+# Пишущие запросы SQLite-ветки: выполняются под write_lock с commit
+_SQLITE_WRITE_RE = re.compile(r"\s*(?:INSERT|UPDATE|DELETE|REPLACE)\b", re.IGNORECASE)
+
 
 class DatabaseAdapter:
     """Unified interface для работы с PostgreSQL и SQLite"""
@@ -39,6 +47,48 @@ class DatabaseAdapter:
         self.db_type = None
         self.schema = None  # ✅ NEW: Store schema name
         self._initialized = False
+        # SQL, которые подготавливаются на каждом новом соединении пула
+        self._warmup_queries: Set[str] = set()
+
+    def register_warmup_queries(self, *queries: str) -> None:
+        """Зарегистрировать SQL для прогрева кэша prepared statements
+
+        Репозитории регистрируют свои горячие запросы при импорте; текст
+        должен совпадать с тем, что передается в fetch/execute, т.к. кэш
+        asyncpg ключуется текстом запроса.
+        """
+        self._warmup_queries.update(queries)
+
+    async def _warmup_connection(self, conn: asyncpg.Connection) -> None:
+        """Init-хук пула: подготовить зарегистрированные запросы
+
+        Публичный Connection.prepare() не кладет statement в кэш соединения,
+        поэтому используется приватный _prepare(use_cache=True) - тот же путь,
+        что и у fetch/execute. Если в установленной версии asyncpg его нет
+        или сигнатура изменилась - публичный prepare(): кэш не прогреется,
+        но инициализация пула не падает. Ошибки (например, таблиц еще нет
+        при первом запуске) не мешают выдаче соединения: запрос
+        подготовится при первом вызове.
+        """
+        prepare_cached = getattr(conn, "_prepare", None)
+        if prepare_cached is None and self._warmup_queries:
+            logger.warning(
+                "asyncpg Connection._prepare unavailable - warmup uses public prepare()"
+            )
+
+        for query in self._warmup_queries:
+            try:
+                if prepare_cached is not None:
+                    try:
+                        await prepare_cached(query, use_cache=True)
+                        continue
+                    except TypeError as e:
+                        # Приватный API изменился - дальше только публичный
+                        logger.warning("asyncpg _prepare() incompatible, falling back: %s", e)
+                        prepare_cached = None
+                await conn.prepare(query)
+            except Exception as e:
+                logger.debug("Warmup skipped for query %r: %s", query[:50], e)
 
     async def init_pool(self) -> None:
         """Инициализация connection pool
@@ -55,9 +105,11 @@ class DatabaseAdapter:
         from config import (
             DATABASE_URL,
             DB_COMMAND_TIMEOUT,
+            DB_MAX_CACHEABLE_STATEMENT_SIZE,
             DB_POOL_MAX_SIZE,
             DB_POOL_MIN_SIZE,
             DB_POOL_TIMEOUT,
+            DB_STATEMENT_CACHE_SIZE,
             DB_TYPE,
             PG_SCHEMA,
         )
@@ -73,6 +125,11 @@ class DatabaseAdapter:
                     max_size=DB_POOL_MAX_SIZE,
                     timeout=DB_POOL_TIMEOUT,
                     command_timeout=DB_COMMAND_TIMEOUT,
+                    # Все SQL репозиториев - статические литералы: кэш prepared
+                    # statements на соединение позволяет пропускать parse+plan
+                    statement_cache_size=DB_STATEMENT_CACHE_SIZE,
+                    max_cacheable_statement_size=DB_MAX_CACHEABLE_STATEMENT_SIZE,
+                    init=self._warmup_connection,
                     # ✅ FIX: Установка search_path для изоляции клиентов
                     server_settings={
                         "search_path": PG_SCHEMA,  # ✅ CRITICAL: Multi-tenant isolation
@@ -114,13 +171,11 @@ class DatabaseAdapter:
             async with self.pool.acquire() as conn:
                 yield PostgreSQLConnection(conn, self.schema)
         else:
-            # Legacy SQLite fallback
-            import aiosqlite
-            from config import DATABASE_PATH
+            # Legacy SQLite fallback: общее долгоживущее соединение с уже
+            # выполненными PRAGMA вместо открытия файла на каждый запрос
+            from database.repositories._conn import get_conn
 
-            async with aiosqlite.connect(DATABASE_PATH) as conn:
-                conn.row_factory = aiosqlite.Row
-                yield SQLiteConnection(conn)
+            yield SQLiteConnection(await get_conn())
 
     async def execute(
         self, query: str, *args, timeout: Optional[float] = None
@@ -187,6 +242,46 @@ class DatabaseAdapter:
         async with self.acquire() as conn:
             return await conn.fetchval(query, *args, column=column, timeout=timeout)
 
+    async def fetchcol(
+        self, query: str, *args, column: int = 0, timeout: Optional[float] = None
+    ) -> List[Any]:
+        """Выполнение SELECT с возвратом одной колонки всех строк
+
+        Значения берутся из строк драйвера по индексу, без построения
+        словаря на каждую строку (как в fetch).
+
+        Args:
+            query: SQL запрос
+            *args: Параметры запроса
+            column: Индекс колонки (0-based)
+            timeout: Таймаут выполнения
+
+        Returns:
+            Список значений колонки
+        """
+        async with self.acquire() as conn:
+            return await conn.fetchcol(query, *args, column=column, timeout=timeout)
+
+    async def iterate(
+        self, query: str, *args, prefetch: Optional[int] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Выполнение SELECT с потоковой выдачей строк через курсор
+
+        Строки читаются порциями по prefetch, соединение занято до конца
+        итерации (или до выхода из async for).
+
+        Args:
+            query: SQL запрос
+            *args: Параметры запроса
+            prefetch: Размер порции (None - по умолчанию драйвера)
+
+        Yields:
+            Словари с данными
+        """
+        async with self.acquire() as conn:
+            async for row in conn.iterate(query, *args, prefetch=prefetch):
+                yield row
+
 
 class PostgreSQLConnection:
     """Wrapper для asyncpg connection
@@ -220,6 +315,20 @@ class PostgreSQLConnection:
     ) -> Any:
         return await self.conn.fetchval(query, *args, column=column, timeout=timeout)
 
+    async def fetchcol(
+        self, query: str, *args, column: int = 0, timeout: Optional[float] = None
+    ) -> List[Any]:
+        rows = await self.conn.fetch(query, *args, timeout=timeout)
+        return [row[column] for row in rows]
+
+    async def iterate(
+        self, query: str, *args, prefetch: Optional[int] = None
+    ) -> AsyncIterator[Dict]:
+        # Курсоры asyncpg работают только внутри транзакции
+        async with self.conn.transaction():
+            async for row in self.conn.cursor(query, *args, prefetch=prefetch):
+                yield dict(row)
+
     def transaction(self):
         """Начать транзакцию
 
@@ -230,35 +339,68 @@ class PostgreSQLConnection:
 
 
 class SQLiteConnection:
-    """Wrapper для aiosqlite connection (legacy)"""
+    """Wrapper для aiosqlite connection (legacy)
+
+    Соединение общее для всех корутин (_conn.get_conn()), поэтому любой
+    пишущий запрос - и через execute, и INSERT ... RETURNING через
+    fetch*/fetchrow - выполняется под write_lock и сразу фиксируется.
+    transaction() держит write_lock до commit/rollback: чужие записи не
+    попадают в ее транзакцию и не откатываются вместе с ней.
+    """
 
     def __init__(self, conn):
         self.conn = conn
+        # True внутри transaction(): write_lock уже захвачен, commit - в конце
+        self._in_transaction = False
+
+    async def _run(self, query: str, args: tuple, fetch_mode: Optional[str] = None) -> Any:
+        """Выполнить запрос; пишущие - под write_lock с commit
+
+        fetch_mode: None - вернуть rowcount, "one" - одну строку, "all" - все строки.
+        """
+        sqlite_query = self._convert_placeholders(query)
+        if self._in_transaction or not _SQLITE_WRITE_RE.match(sqlite_query):
+            return await self._execute_fetch(sqlite_query, args, fetch_mode)
+
+        from database.repositories._conn import write_lock
+
+        async with write_lock:
+            try:
+                result = await self._execute_fetch(sqlite_query, args, fetch_mode)
+                await self.conn.commit()
+            except Exception:
+                await self.conn.rollback()
+                raise
+        return result
+
+    async def _execute_fetch(
+        self, sqlite_query: str, args: tuple, fetch_mode: Optional[str]
+    ) -> Any:
+        cursor = await self.conn.execute(sqlite_query, args)
+        if fetch_mode == "one":
+            return await cursor.fetchone()
+        if fetch_mode == "all":
+            return await cursor.fetchall()
+        return cursor.rowcount
 
     async def execute(
         self, query: str, *args, timeout: Optional[float] = None
     ) -> str:
         # SQLite использует ? вместо $1, $2
         # Конвертируем параметры
-        sqlite_query = self._convert_placeholders(query)
-        cursor = await self.conn.execute(sqlite_query, args)
-        await self.conn.commit()
-        return f"Rows affected: {cursor.rowcount}"
+        rowcount = await self._run(query, args)
+        return f"Rows affected: {rowcount}"
 
     async def fetch(
         self, query: str, *args, timeout: Optional[float] = None
     ) -> List[Dict]:
-        sqlite_query = self._convert_placeholders(query)
-        cursor = await self.conn.execute(sqlite_query, args)
-        rows = await cursor.fetchall()
+        rows = await self._run(query, args, "all")
         return [dict(row) for row in rows]
 
     async def fetchrow(
         self, query: str, *args, timeout: Optional[float] = None
     ) -> Optional[Dict]:
-        sqlite_query = self._convert_placeholders(query)
-        cursor = await self.conn.execute(sqlite_query, args)
-        row = await cursor.fetchone()
+        row = await self._run(query, args, "one")
         return dict(row) if row else None
 
     async def fetchval(
@@ -267,15 +409,47 @@ class SQLiteConnection:
         row = await self.fetchrow(query, *args)
         return list(row.values())[column] if row else None
 
+    async def fetchcol(
+        self, query: str, *args, column: int = 0, timeout: Optional[float] = None
+    ) -> List[Any]:
+        rows = await self._run(query, args, "all")
+        return [row[column] for row in rows]
+
+    async def iterate(
+        self, query: str, *args, prefetch: Optional[int] = None
+    ) -> AsyncIterator[Dict]:
+        # Потоковое чтение - только SELECT, блокировка не нужна
+        sqlite_query = self._convert_placeholders(query)
+        async with self.conn.execute(sqlite_query, args) as cursor:
+            if prefetch:
+                cursor.arraysize = prefetch
+            async for row in cursor:
+                yield dict(row)
+
     @asynccontextmanager
     async def transaction(self):
-        """Эмуляция транзакции для SQLite"""
-        try:
+        """Эмуляция транзакции для SQLite
+
+        write_lock держится до commit/rollback, запросы внутри не берут его
+        повторно и не фиксируются по одному.
+        """
+        if self._in_transaction:
+            # Вложенный вызов - работает внутри внешней транзакции
             yield
-            await self.conn.commit()
-        except Exception:
-            await self.conn.rollback()
-            raise
+            return
+
+        from database.repositories._conn import write_lock
+
+        async with write_lock:
+            self._in_transaction = True
+            try:
+                yield
+                await self.conn.commit()
+            except BaseException:
+                await self.conn.rollback()
+                raise
+            finally:
+                self._in_transaction = False
 
     @staticmethod
     def _convert_placeholders(query: str) -> str:
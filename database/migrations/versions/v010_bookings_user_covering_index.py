@@ -0,0 +1,81 @@
+"""Migration v010: Покрывающий индекс bookings(user_id, time, service_id)
+
+get_favorite_slots фильтрует по user_id и группирует по (time, service_id):
+составной индекс дает index-only scan. Одноколоночный idx_bookings_user -
+его префикс, поэтому удаляется один раз этой миграцией, а не на каждом
+SchemaManager.init_schema().
+"""
+
+import logging
+from typing import List
+
+import aiosqlite
+
+from database.migrations.migration_manager import Migration
+
+
+class V010BookingsUserCoveringIndex(Migration):
+    """Migration v010: idx_bookings_user_time_svc вместо idx_bookings_user"""
+
+    version = 10
+    description = "Replace idx_bookings_user with covering idx_bookings_user_time_svc"
+
+    async def upgrade(self, db: aiosqlite.Connection):
+        """Apply migration (SQLite)"""
+        await db.execute(
+            "CREATE INDEX IF NOT EXISTS idx_bookings_user_time_svc "
+            "ON bookings(user_id, time, service_id)"
+        )
+        await db.execute("DROP INDEX IF EXISTS idx_bookings_user")
+
+    async def downgrade(self, db: aiosqlite.Connection):
+        """Rollback migration (SQLite)"""
+        await db.execute("CREATE INDEX IF NOT EXISTS idx_bookings_user ON bookings(user_id)")
+        await db.execute("DROP INDEX IF EXISTS idx_bookings_user_time_svc")
+
+    @staticmethod
+    async def upgrade_postgres(schema_names: List[str]) -> None:
+        """Apply migration (PostgreSQL schemas)
+
+        Новый индекс создает SchemaManager.init_schema(); здесь удаляется
+        только старый idx_bookings_user в уже существующих schemas.
+        """
+        from database.db_adapter import db_adapter
+
+        for schema_name in schema_names:
+            await db_adapter.execute(f"DROP INDEX IF EXISTS {schema_name}.idx_bookings_user")
+            logging.info(f"[v010] Dropped {schema_name}.idx_bookings_user")
+
+
+# Регистрация миграции
+if __name__ == "__main__":
+    import asyncio
+    import sys
+    from pathlib import Path
+
+    # Добавляем корневую директорию в sys.path
+    root_dir = Path(__file__).parent.parent.parent.parent
+    sys.path.insert(0, str(root_dir))
+
+    from config import DATABASE_PATH, DB_TYPE
+    from database.db_adapter import db_adapter
+    from database.migrations.migration_manager import MigrationManager
+    from database.schema_manager import SchemaManager
+
+    async def main():
+        if DB_TYPE == "postgresql":
+            await db_adapter.init_pool()
+            try:
+                schema_names = await SchemaManager.list_schemas()
+                if db_adapter.schema and db_adapter.schema not in schema_names:
+                    schema_names.append(db_adapter.schema)
+                await V010BookingsUserCoveringIndex.upgrade_postgres(schema_names)
+            finally:
+                await db_adapter.close_pool()
+        else:
+            manager = MigrationManager(DATABASE_PATH)
+            manager.register(V010BookingsUserCoveringIndex)
+            await manager.migrate()
+        print("✅ Migration v010 applied successfully")
+
+    asyncio.run(main())
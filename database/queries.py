@@ -5,7 +5,8 @@
 """
 
 import logging
-from typing import Dict, List, Optional, Tuple
+from array import array
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
 
 from database.repositories import (
     AdminRepository,
@@ -14,7 +15,6 @@ from database.repositories import (
     ClientStats,
     UserRepository,
 )
-from database.repositories.calendar_repository import CalendarRepository
 from database.repositories.settings_repository import SettingsRepository
 from database.schema_manager import SchemaManager  # ✅ NEW
 
@@ -59,9 +59,9 @@ class Database:
             f"   • All tables created with indexes"
         )
 
-        # Инициализация дополнительных таблиц
+        # DDL всех репозиториев (в т.ч. календаря) - в SchemaManager,
+        # здесь остается только заполнение настроек по умолчанию
         await SettingsRepository.init_settings_table()
-        await CalendarRepository.init_calendar_tables()
         logging.info("✅ All database tables initialized")
 
     # === БРОНИРОВАНИЯ (делегирование в BookingRepository) ===
@@ -70,6 +70,11 @@ class Database:
     async def is_slot_free(date_str: str, time_str: str) -> bool:
         return await BookingRepository.is_slot_free(date_str, time_str)
 
+    @staticmethod
+    async def get_taken_times_for_day(date_str: str) -> Set[str]:
+        """Получить занятые времена дня (брони + блокировки)"""
+        return await BookingRepository.get_taken_times_for_day(date_str)
+
     @staticmethod
     async def get_occupied_slots_for_day(date_str: str) -> List[Tuple[str, int]]:
         """Получить занятые слоты с длительностью
@@ -79,6 +84,11 @@ class Database:
         """
         return await BookingRepository.get_occupied_slots_for_day(date_str)
 
+    @staticmethod
+    async def get_occupied_intervals_for_day(date_str: str) -> Tuple[array, array]:
+        """Получить занятые слоты как (starts, durations) в минутах"""
+        return await BookingRepository.get_occupied_intervals_for_day(date_str)
+
     @staticmethod
     async def get_month_statuses(year: int, month: int) -> Dict[str, str]:
         return await BookingRepository.get_month_statuses(year, month)
@@ -209,6 +219,10 @@ class Database:
     async def get_all_users() -> List[int]:
         return await UserRepository.get_all_users()
 
+    @staticmethod
+    def iter_all_users() -> AsyncIterator[int]:
+        return UserRepository.iter_all_users()
+
     @staticmethod
     async def get_total_users_count() -> int:
         return await UserRepository.get_total_users_count()
@@ -0,0 +1,88 @@
+"""Общее долгоживущее aiosqlite-соединение для legacy-репозиториев
+
+Используется и SQLite-веткой db_adapter.
+
+Вместо `async with aiosqlite.connect(DATABASE_PATH)` на каждый вызов
+(открытие файла, сброс PRAGMA, холодный page cache) репозитории берут
+одно соединение, настроенное один раз при создании.
+
+Examples:
+    >>> db = await get_conn()
+    >>> async with db.execute("SELECT ...") as cursor:
+    ...     row = await cursor.fetchone()
+    >>> async with write_lock:
+    ...     await db.execute("UPDATE ...")
+    ...     await db.commit()
+"""
+
+import asyncio
+import logging
+from typing import Optional
+
+import aiosqlite
+
+from config import DATABASE_PATH
+
+logger = logging.getLogger(__name__)
+
+# PRAGMA действуют на соединение - выполняются один раз при его создании
+_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",  # 64 МиБ
+    "PRAGMA mmap_size=268435456",  # 256 МиБ
+    "PRAGMA busy_timeout=5000",
+)
+
+_conn: Optional[aiosqlite.Connection] = None
+_conn_lock = asyncio.Lock()
+
+# Один писатель: execute + commit на общем соединении выполняются под этим
+# замком, чтобы commit одной корутины не фиксировал чужую половину записи
+# и конкурентные записи не упирались в SQLITE_BUSY. Чтение - без замка (WAL).
+write_lock = asyncio.Lock()
+
+
+async def get_conn() -> aiosqlite.Connection:
+    """Получить общее соединение (создается лениво при первом вызове)"""
+    global _conn
+    if _conn is not None:
+        return _conn
+
+    async with _conn_lock:
+        if _conn is None:
+            conn = await aiosqlite.connect(DATABASE_PATH)
+            # Row поддерживает и доступ по индексу, и dict(row) для db_adapter
+            conn.row_factory = aiosqlite.Row
+            for pragma in _PRAGMAS:
+                await conn.execute(pragma)
+            _conn = conn
+            logger.info("✅ Shared SQLite connection opened: %s", DATABASE_PATH)
+    return _conn
+
+
+async def optimize_conn() -> None:
+    """PRAGMA optimize на общем соединении (периодически и перед закрытием)
+
+    Обновляет статистику планировщика для таблиц, где она устарела, -
+    долгоживущее соединение иначе дрейфует к неоптимальным планам.
+    Соединение ради этого не открывается.
+    """
+    if _conn is None:
+        return
+    try:
+        async with write_lock:
+            await _conn.execute("PRAGMA optimize")
+    except Exception as e:
+        logger.warning("PRAGMA optimize failed: %s", e)
+
+
+async def close_conn() -> None:
+    """Закрыть общее соединение (при shutdown)"""
+    global _conn
+    if _conn is not None:
+        await optimize_conn()
+        await _conn.close()
+        _conn = None
+        logger.info("Shared SQLite connection closed")
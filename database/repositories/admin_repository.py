@@ -4,7 +4,8 @@
 """
 
 import logging
-from typing import List, Optional, Tuple
+import time
+from typing import List, Optional, Set, Tuple
 
 from database.db_adapter import db_adapter  # ✅ NEW
 from utils.helpers import now_local
@@ -16,15 +17,59 @@ class AdminRepository:
     ✅ FIXED: Использует db_adapter вместо aiosqlite
     """
 
-    @staticmethod
-    async def is_admin(user_id: int) -> bool:
-        """Проверить является ли пользователь админом"""
+    # user_id админов из БД: (set, expiry по time.monotonic()).
+    # is_admin вызывается на каждое нажатие админ-кнопки - таблица
+    # крошечная, поэтому id грузятся целиком одним SELECT и попадания
+    # проверяются по памяти. Кэшируется только "является админом": роли
+    # (права через has_permission) всегда читаются из БД, чтобы
+    # понижение/удаление в другом процессе действовало сразу.
+    _ADMIN_IDS_CACHE_TTL = 60
+    _admin_ids_cache: Optional[Tuple[Set[int], float]] = None
+
+    @classmethod
+    async def _load_admin_ids(cls) -> Set[int]:
+        """user_id всех админов из БД (из кэша, при промахе - один SELECT)
+
+        Ошибки БД пробрасываются вызывающему коду.
+        """
+        cached = cls._admin_ids_cache
+        if cached is not None and time.monotonic() < cached[1]:
+            return cached[0]
+
+        admin_ids = set(await db_adapter.fetchcol("SELECT user_id FROM admins"))
+        cls._admin_ids_cache = (admin_ids, time.monotonic() + cls._ADMIN_IDS_CACHE_TTL)
+        return admin_ids
+
+    @classmethod
+    def _update_admin_ids_cache(cls, user_id: int, removed: bool = False) -> None:
+        """Применить свою запись к кэшу id админов (если он загружен)"""
+        if cls._admin_ids_cache is None:
+            return
+        admin_ids = cls._admin_ids_cache[0]
+        if removed:
+            admin_ids.discard(user_id)
+        else:
+            admin_ids.add(user_id)
+
+    @classmethod
+    async def is_admin(cls, user_id: int) -> bool:
+        """Проверить является ли пользователь админом
+
+        Попадание в кэш - сразу True. Снимок может не знать админа,
+        добавленного другим процессом или напрямую в БД: перед отказом
+        проверяем саму строку, найденного админа добавляем в кэш.
+        """
         try:
+            if user_id in await cls._load_admin_ids():
+                return True
+
             exists = await db_adapter.fetchval(
                 "SELECT EXISTS(SELECT 1 FROM admins WHERE user_id=$1)",
                 user_id
             )
-            return exists or False
+            if exists:
+                cls._update_admin_ids_cache(user_id)
+            return bool(exists)
         except Exception as e:
             logging.error(f"Error checking admin status for {user_id}: {e}")
             return False
@@ -58,8 +103,9 @@ class AdminRepository:
             logging.error(f"Error getting all admins: {e}")
             return []
 
-    @staticmethod
+    @classmethod
     async def add_admin(
+        cls,
         user_id: int,
         username: Optional[str] = None,
         added_by: Optional[int] = None,
@@ -72,6 +118,7 @@ class AdminRepository:
                 "VALUES ($1, $2, $3, $4, $5)",
                 user_id, username, added_by, now_local(), role
             )
+            cls._update_admin_ids_cache(user_id)
             logging.info(f"Admin added: {user_id} (role={role})")
             return True
         except Exception as e:
@@ -81,8 +128,8 @@ class AdminRepository:
                 logging.error(f"Error adding admin {user_id}: {e}")
             return False
 
-    @staticmethod
-    async def remove_admin(user_id: int) -> bool:
+    @classmethod
+    async def remove_admin(cls, user_id: int) -> bool:
         """Удалить администратора"""
         try:
             result = await db_adapter.execute(
@@ -91,6 +138,7 @@ class AdminRepository:
             )
             deleted = "DELETE 1" in result
             if deleted:
+                cls._update_admin_ids_cache(user_id, removed=True)
                 logging.info(f"Admin removed: {user_id}")
             return deleted
         except Exception as e:
@@ -5,6 +5,7 @@
 
 import calendar
 import logging
+from array import array
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Set, Tuple
 
@@ -16,8 +17,61 @@ from config import (
     WORK_HOURS_START,
 )
 from database.db_adapter import db_adapter  # ✅ NEW
+from database.repositories.service_repository import ServicesCache
 from utils.helpers import now_local
 
+# Статусы дня по индексу: свободен / частично занят / полностью занят
+_DAY_STATUSES = ("🟢", "🟡", "🔴")
+
+# Размер пачки для cleanup_old_bookings
+_CLEANUP_BATCH_SIZE = 10000
+
+# Горячие SELECT-запросы вынесены в константы: тот же текст SQL
+# прогревается в кэше prepared statements при открытии соединения
+_SQL_BOOKING_EXISTS = "SELECT EXISTS(SELECT 1 FROM bookings WHERE date=$1 AND time=$2)"
+_SQL_BLOCKED_EXISTS = "SELECT EXISTS(SELECT 1 FROM blocked_slots WHERE date=$1 AND time=$2)"
+_SQL_TAKEN_TIMES = """SELECT time FROM bookings WHERE date = $1
+    UNION
+    SELECT time FROM blocked_slots WHERE date = $1"""
+_SQL_DAY_BOOKINGS = "SELECT time, service_id FROM bookings WHERE date = $1"
+_SQL_DAY_BLOCKED = "SELECT time FROM blocked_slots WHERE date = $1"
+_SQL_MONTH_COUNTS = """SELECT date, COUNT(*) as total_count FROM (
+        SELECT date FROM bookings
+        WHERE date BETWEEN $1 AND $2
+        UNION ALL
+        SELECT date FROM blocked_slots
+        WHERE date BETWEEN $1 AND $2
+    ) AS occupied GROUP BY date"""
+_SQL_USER_BOOKINGS = """SELECT id, date, time, username, created_at, service_id
+    FROM bookings
+    WHERE user_id = $1 AND date >= $2
+    ORDER BY date, time"""
+_SQL_BOOKING_BY_ID = "SELECT date, time, username FROM bookings WHERE id=$1 AND user_id=$2"
+
+db_adapter.register_warmup_queries(
+    _SQL_BOOKING_EXISTS,
+    _SQL_BLOCKED_EXISTS,
+    _SQL_TAKEN_TIMES,
+    _SQL_DAY_BOOKINGS,
+    _SQL_DAY_BLOCKED,
+    _SQL_MONTH_COUNTS,
+    _SQL_USER_BOOKINGS,
+    _SQL_BOOKING_BY_ID,
+)
+
+
+def _resolve_service(
+    services: Dict[int, Dict], service_id: Optional[int], default_name: str
+) -> Tuple[str, int, str]:
+    """Название, длительность и цена услуги из ServicesCache
+
+    Повторяет COALESCE-значения прежнего LEFT JOIN services.
+    """
+    service = services.get(service_id)
+    if service is None:
+        return default_name, 60, "—"
+    return service["name"], service["duration_minutes"], service["price"] or "—"
+
 
 class BookingRepository:
     """Репозиторий для управления бронированиями
@@ -30,22 +84,29 @@ class BookingRepository:
         """Проверить свободен ли слот (включая блокировки)"""
         try:
             # Проверяем бронирование
-            booking_exists = await db_adapter.fetchval(
-                "SELECT EXISTS(SELECT 1 FROM bookings WHERE date=$1 AND time=$2)",
-                date_str, time_str
-            )
+            booking_exists = await db_adapter.fetchval(_SQL_BOOKING_EXISTS, date_str, time_str)
             
             # Проверяем блокировку
-            blocked_exists = await db_adapter.fetchval(
-                "SELECT EXISTS(SELECT 1 FROM blocked_slots WHERE date=$1 AND time=$2)",
-                date_str, time_str
-            )
+            blocked_exists = await db_adapter.fetchval(_SQL_BLOCKED_EXISTS, date_str, time_str)
 
             return not booking_exists and not blocked_exists
         except Exception as e:
-            logging.error(f"Error checking slot {date_str} {time_str}: {e}")
+            logging.error("Error checking slot %s %s: %s", date_str, time_str, e)
             return False
 
+    @staticmethod
+    async def get_taken_times_for_day(date_str: str) -> Set[str]:
+        """Получить все занятые времена дня (брони + блокировки) одним запросом
+
+        Для проверки нескольких слотов одного дня: `time_str not in taken`
+        вместо отдельного is_slot_free() на каждый слот.
+
+        Returns:
+            Set[time_str], например {'10:00', '14:00'}
+        """
+        rows = await db_adapter.fetch(_SQL_TAKEN_TIMES, date_str)
+        return {row["time"] for row in rows}
+
     @staticmethod
     async def get_occupied_slots_for_day(date_str: str) -> List[Tuple[str, int]]:
         """Получить все занятые слоты за день с длительностью
@@ -56,71 +117,85 @@ class BookingRepository:
         """
         occupied = []
         try:
-            # Забронированные с duration из services
-            bookings = await db_adapter.fetch(
-                """SELECT b.time, COALESCE(s.duration_minutes, 60) as duration
-                FROM bookings b
-                LEFT JOIN services s ON b.service_id = s.id
-                WHERE b.date = $1""",
-                date_str
-            )
+            # Забронированные с duration из кэша услуг
+            bookings = await db_adapter.fetch(_SQL_DAY_BOOKINGS, date_str)
             if bookings:
-                occupied.extend((row["time"], row["duration"]) for row in bookings)
+                services = await ServicesCache.get_all()
+                occupied.extend(
+                    (row["time"], _resolve_service(services, row["service_id"], "")[1])
+                    for row in bookings
+                )
 
             # Заблокированные (длительность 60 мин по умолчанию)
-            blocked = await db_adapter.fetch(
-                "SELECT time FROM blocked_slots WHERE date = $1",
-                date_str
-            )
+            blocked = await db_adapter.fetch(_SQL_DAY_BLOCKED, date_str)
             if blocked:
                 occupied.extend((row["time"], 60) for row in blocked)
 
         except Exception as e:
-            logging.error(f"Error getting occupied slots for {date_str}: {e}")
+            logging.error("Error getting occupied slots for %s: %s", date_str, e)
 
         return occupied
 
+    @staticmethod
+    async def get_occupied_intervals_for_day(date_str: str) -> Tuple[array, array]:
+        """Занятые слоты дня в виде двух параллельных массивов (SoA)
+
+        Вариант get_occupied_slots_for_day() для проверки пересечений:
+        время уже переведено в минуты от начала суток, поэтому вызывающему
+        коду не нужно парсить строки времени на каждое сравнение.
+
+        Returns:
+            Tuple[starts, durations] - array('H') минут начала и длительностей
+            Например: (array('H', [600, 840]), array('H', [60, 90]))
+        """
+        occupied = await BookingRepository.get_occupied_slots_for_day(date_str)
+        starts = array("H")
+        durations = array("H")
+        for time_str, duration in occupied:
+            # Битая строка пропускается с записью в лог: остальные слоты дня
+            # остаются занятыми, а не весь день становится свободным
+            try:
+                hours, minutes = time_str.split(":")[:2]
+                start = int(hours) * 60 + int(minutes)
+                # Без длительности - 60 мин, как у заблокированных слотов
+                length = int(duration) if duration is not None else 60
+                if not (0 <= start < 24 * 60 and 0 < length <= 24 * 60):
+                    raise ValueError("out of range")
+            except (AttributeError, TypeError, ValueError) as e:
+                logging.error(
+                    "Skipping malformed occupied slot %r/%r for %s: %s",
+                    time_str, duration, date_str, e
+                )
+                continue
+            starts.append(start)
+            durations.append(length)
+        return starts, durations
+
     @staticmethod
     async def get_month_statuses(year: int, month: int) -> Dict[str, str]:
         """Получить статусы всех дней месяца"""
         try:
-            first_day = datetime(year, month, 1).date()
+            # Колонки date в схеме тенанта - TEXT (YYYY-MM-DD): границы
+            # формируем сразу строками того же формата, без date -> isoformat()
             last_day_num = calendar.monthrange(year, month)[1]
-            last_day = datetime(year, month, last_day_num).date()
+            first_day = f"{year:04d}-{month:02d}-01"
+            last_day = f"{year:04d}-{month:02d}-{last_day_num:02d}"
 
             statuses = {}
             total_slots = WORK_HOURS_END - WORK_HOURS_START
 
-            # Объединенный запрос UNION ALL
-            rows = await db_adapter.fetch(
-                """SELECT date, SUM(cnt) as total_count FROM (
-                    SELECT date, COUNT(*) as cnt FROM bookings
-                    WHERE date >= $1 AND date <= $2 GROUP BY date
-                    UNION ALL
-                    SELECT date, COUNT(*) as cnt FROM blocked_slots
-                    WHERE date >= $3 AND date <= $4 GROUP BY date
-                ) GROUP BY date""",
-                first_day.isoformat(),
-                last_day.isoformat(),
-                first_day.isoformat(),
-                last_day.isoformat(),
-            )
+            # Один проход агрегации по UNION ALL "сырых" строк
+            rows = await db_adapter.fetch(_SQL_MONTH_COUNTS, first_day, last_day)
 
             if rows:
                 for row in rows:
-                    date_str = row["date"]
                     total_count = row["total_count"]
-                    
-                    if total_count == 0:
-                        statuses[date_str] = "🟢"
-                    elif total_count < total_slots:
-                        statuses[date_str] = "🟡"
-                    else:
-                        statuses[date_str] = "🔴"
+                    idx = 0 if total_count == 0 else (2 if total_count >= total_slots else 1)
+                    statuses[row["date"]] = _DAY_STATUSES[idx]
 
             return statuses
         except Exception as e:
-            logging.error(f"Error getting month statuses for {year}-{month}: {e}")
+            logging.error("Error getting month statuses for %s-%s: %s", year, month, e)
             return {}
 
     @staticmethod
@@ -142,35 +217,32 @@ class BookingRepository:
         """
         try:
             rows = await db_adapter.fetch(
-                """SELECT
-                    b.user_id,
-                    b.username,
-                    b.time,
-                    b.service_id,
-                    COALESCE(s.name, 'Консультация') as service_name,
-                    COALESCE(s.duration_minutes, 60) as duration_minutes,
-                    b.created_at
-                FROM bookings b
-                LEFT JOIN services s ON b.service_id = s.id
-                WHERE b.date = $1
-                ORDER BY b.time""",
+                """SELECT user_id, username, time, service_id, created_at
+                FROM bookings
+                WHERE date = $1
+                ORDER BY time""",
                 date_str,
             )
 
             if not rows:
                 return []
 
+            services = await ServicesCache.get_all()
+
             # Преобразуем в список словарей
             bookings = []
             for row in rows:
+                service_name, duration, _ = _resolve_service(
+                    services, row["service_id"], "Консультация"
+                )
                 bookings.append(
                     {
                         "user_id": row["user_id"],
                         "username": row["username"] or f"ID{row['user_id']}",
                         "time": row["time"],
                         "service_id": row["service_id"],
-                        "service_name": row["service_name"],
-                        "duration_minutes": row["duration_minutes"],
+                        "service_name": service_name,
+                        "duration_minutes": duration,
                         "created_at": str(row["created_at"]),
                     }
                 )
@@ -178,7 +250,7 @@ class BookingRepository:
             return bookings
 
         except Exception as e:
-            logging.error(f"Error getting bookings for date {date_str}: {e}")
+            logging.error("Error getting bookings for date %s: %s", date_str, e)
             return []
 
     @staticmethod
@@ -199,39 +271,22 @@ class BookingRepository:
             ]]
         """
         try:
-            now = now_local()
+            # "YYYY-MM-DD HH:MM" сравнивается лексикографически в том же
+            # порядке, что и хронологически: без strptime/localize на строку
+            now_str = now_local().strftime("%Y-%m-%d %H:%M:%S")
 
-            rows = await db_adapter.fetch(
-                """SELECT
-                    b.id,
-                    b.date,
-                    b.time,
-                    b.username,
-                    b.created_at,
-                    b.service_id,
-                    COALESCE(s.name, 'Основная услуга') as service_name,
-                    COALESCE(s.duration_minutes, 60) as duration_minutes,
-                    COALESCE(s.price, '—') as price
-                FROM bookings b
-                LEFT JOIN services s ON b.service_id = s.id
-                WHERE b.user_id = $1
-                ORDER BY b.date, b.time""",
-                user_id,
-            )
+            # Прошедшие дни отсекаются в SQL, текущий день - в Python
+            rows = await db_adapter.fetch(_SQL_USER_BOOKINGS, user_id, now_str[:10])
 
             if not rows:
                 return []
 
+            services = await ServicesCache.get_all()
+
             # Фильтруем только будущие
             future_bookings = []
             for row in rows:
-                date_str = row["date"]
-                time_str = row["time"]
-
-                booking_dt_naive = datetime.strptime(f"{date_str} {time_str}", "%Y-%m-%d %H:%M")
-                booking_dt = TIMEZONE.localize(booking_dt_naive)
-
-                if booking_dt >= now:
+                if f"{row['date']} {row['time']}" >= now_str:
                     # Конвертируем в tuple для совместимости
                     future_bookings.append((
                         row["id"],
@@ -240,14 +295,12 @@ class BookingRepository:
                         row["username"],
                         str(row["created_at"]),
                         row["service_id"],
-                        row["service_name"],
-                        row["duration_minutes"],
-                        row["price"],
+                        *_resolve_service(services, row["service_id"], "Основная услуга"),
                     ))
 
             return future_bookings
         except Exception as e:
-            logging.error(f"Error getting bookings for user {user_id}: {e}")
+            logging.error("Error getting bookings for user %s: %s", user_id, e)
             return []
 
     @staticmethod
@@ -258,7 +311,7 @@ class BookingRepository:
             count = len(bookings)
             return count < MAX_BOOKINGS_PER_USER, count
         except Exception as e:
-            logging.error(f"Error checking booking limit for user {user_id}: {e}")
+            logging.error("Error checking booking limit for user %s: %s", user_id, e)
             return False, 0
 
     @staticmethod
@@ -271,18 +324,15 @@ class BookingRepository:
             hours_until = (booking_dt - now).total_seconds() / 3600
             return hours_until >= CANCELLATION_HOURS, hours_until
         except Exception as e:
-            logging.error(f"Error checking cancel possibility: {e}")
+            logging.error("Error checking cancel possibility: %s", e)
             return False, 0.0
 
     @staticmethod
     async def get_booking_by_id(booking_id: int, user_id: int) -> Optional[Tuple[str, str, str]]:
         """Получить запись по ID"""
-        row = await db_adapter.fetchrow(
-            "SELECT date, time, username FROM bookings WHERE id=$1 AND user_id=$2",
-            booking_id, user_id
-        )
+        row = await db_adapter.fetchrow(_SQL_BOOKING_BY_ID, booking_id, user_id)
         if row:
-            return (row["date"], row["time"], row["username"])
+            return tuple(row.values())
         return None
 
     @staticmethod
@@ -294,7 +344,7 @@ class BookingRepository:
                 booking_id
             )
         except Exception as e:
-            logging.error(f"Error getting booking service_id: {e}")
+            logging.error("Error getting booking service_id: %s", e)
             return None
 
     @staticmethod
@@ -309,29 +359,41 @@ class BookingRepository:
             deleted = "DELETE 1" in result or "DELETE 0" not in result
 
             if deleted:
-                logging.info(f"Booking {booking_id} deleted by user {user_id}")
+                logging.info("Booking %s deleted by user %s", booking_id, user_id)
             else:
-                logging.warning(f"Booking {booking_id} not found for user {user_id}")
+                logging.warning("Booking %s not found for user %s", booking_id, user_id)
 
             return deleted
         except Exception as e:
-            logging.error(f"Error deleting booking {booking_id}: {e}")
+            logging.error("Error deleting booking %s: %s", booking_id, e)
             return False
 
     @staticmethod
     async def cleanup_old_bookings(before_date: str) -> int:
-        """Удалить старые записи"""
+        """Удалить старые записи
+
+        Удаление идет пачками по _CLEANUP_BATCH_SIZE строк: каждая пачка -
+        отдельная короткая транзакция, без долгих блокировок на большом
+        окне хранения.
+        """
         try:
-            result = await db_adapter.execute(
-                "DELETE FROM bookings WHERE date < $1",
-                before_date
-            )
-            # Парсим "DELETE N"
-            deleted_count = int(result.split()[-1]) if result else 0
-            logging.info(f"Cleaned up {deleted_count} old bookings")
+            deleted_count = 0
+            while True:
+                result = await db_adapter.execute(
+                    """DELETE FROM bookings WHERE id IN (
+                        SELECT id FROM bookings WHERE date < $1 LIMIT $2
+                    )""",
+                    before_date, _CLEANUP_BATCH_SIZE
+                )
+                # Парсим "DELETE N"
+                batch_count = int(result.split()[-1]) if result else 0
+                deleted_count += batch_count
+                if batch_count < _CLEANUP_BATCH_SIZE:
+                    break
+            logging.info("Cleaned up %s old bookings", deleted_count)
             return deleted_count
         except Exception as e:
-            logging.error(f"Error cleaning up old bookings: {e}")
+            logging.error("Error cleaning up old bookings: %s", e)
             return 0
 
     @staticmethod
@@ -347,29 +409,24 @@ class BookingRepository:
             )
 
             rows = await db_adapter.fetch(
-                """SELECT
-                    b.date,
-                    b.time,
-                    b.username,
-                    COALESCE(s.name, 'Услуга') as service_name,
-                    COALESCE(s.duration_minutes, 60) as duration,
-                    COALESCE(s.price, '—') as price
-                FROM bookings b
-                LEFT JOIN services s ON b.service_id = s.id
-                WHERE b.date >= $1 AND b.date <= $2
-                ORDER BY b.date, b.time""",
+                """SELECT date, time, username, service_id
+                FROM bookings
+                WHERE date >= $1 AND date <= $2
+                ORDER BY date, time""",
                 start_date, end_date
             )
             
             if not rows:
                 return []
             
+            services = await ServicesCache.get_all()
+
             # Конвертируем в tuples
-            return [(row["date"], row["time"], row["username"], 
-                     row["service_name"], row["duration"], row["price"]) 
+            return [(row["date"], row["time"], row["username"],
+                     *_resolve_service(services, row["service_id"], "Услуга"))
                     for row in rows]
         except Exception as e:
-            logging.error(f"Error getting week schedule: {e}")
+            logging.error("Error getting week schedule: %s", e)
             return []
 
     @staticmethod
@@ -381,14 +438,14 @@ class BookingRepository:
                 "VALUES ($1, $2, $3, $4, $5)",
                 date_str, time_str, reason, admin_id, now_local()
             )
-            logging.info(f"Slot {date_str} {time_str} blocked by admin {admin_id}")
+            logging.info("Slot %s %s blocked by admin %s", date_str, time_str, admin_id)
             return True
         except Exception as e:
             # PostgreSQL unique constraint violation
             if "duplicate key" in str(e).lower() or "unique" in str(e).lower():
-                logging.warning(f"Slot {date_str} {time_str} already blocked or booked")
+                logging.warning("Slot %s %s already blocked or booked", date_str, time_str)
                 return False
-            logging.error(f"Error blocking slot {date_str} {time_str}: {e}")
+            logging.error("Error blocking slot %s %s: %s", date_str, time_str, e)
             return False
 
     @staticmethod
@@ -446,7 +503,8 @@ class BookingRepository:
                             date_str, time_str
                         )
                         logging.info(
-                            f"Cancelled {len(cancelled_users)} booking(s) for slot {date_str} {time_str}"
+                            "Cancelled %s booking(s) for slot %s %s",
+                            len(cancelled_users), date_str, time_str
                         )
 
                     # Блокируем слот
@@ -457,17 +515,17 @@ class BookingRepository:
                     )
 
                     logging.info(
-                        f"Slot {date_str} {time_str} blocked by admin {admin_id} "
-                        f"with {len(cancelled_users)} cancellations"
+                        "Slot %s %s blocked by admin %s with %s cancellations",
+                        date_str, time_str, admin_id, len(cancelled_users)
                     )
 
                     return True, cancelled_users
 
         except Exception as e:
             if "duplicate key" in str(e).lower() or "unique" in str(e).lower():
-                logging.warning(f"Slot {date_str} {time_str} already blocked")
+                logging.warning("Slot %s %s already blocked", date_str, time_str)
                 return False, []
-            logging.error(f"Error blocking slot with notification {date_str} {time_str}: {e}")
+            logging.error("Error blocking slot with notification %s %s: %s", date_str, time_str, e)
             return False, []
 
     @staticmethod
@@ -480,10 +538,10 @@ class BookingRepository:
             )
             deleted = "DELETE 1" in result
             if deleted:
-                logging.info(f"Slot {date_str} {time_str} unblocked")
+                logging.info("Slot %s %s unblocked", date_str, time_str)
             return deleted
         except Exception as e:
-            logging.error(f"Error unblocking slot {date_str} {time_str}: {e}")
+            logging.error("Error unblocking slot %s %s: %s", date_str, time_str, e)
             return False
 
     @staticmethod
@@ -503,9 +561,10 @@ class BookingRepository:
             if not rows:
                 return []
             
-            return [(row["date"], row["time"], row["reason"]) for row in rows]
+            # Колонки уже в нужном порядке - без поиска полей по имени
+            return [tuple(row.values()) for row in rows]
         except Exception as e:
-            logging.error(f"Error getting blocked slots: {e}")
+            logging.error("Error getting blocked slots: %s", e)
             return []
 
     @staticmethod
@@ -528,11 +587,11 @@ class BookingRepository:
             updated_count = int(result.split()[-1]) if result else 0
 
             logging.info(
-                f"Mass service update: {updated_count} bookings on {date_str} "
-                f"changed to service_id={new_service_id}"
+                "Mass service update: %s bookings on %s changed to service_id=%s",
+                updated_count, date_str, new_service_id
             )
 
             return updated_count
         except Exception as e:
-            logging.error(f"Error in mass_update_service for {date_str}: {e}")
+            logging.error("Error in mass_update_service for %s: %s", date_str, e)
             return 0
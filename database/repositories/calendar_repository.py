@@ -4,22 +4,320 @@
 """
 
 import logging
+import time
+from datetime import date
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 
 from database.db_adapter import db_adapter  # ✅ NEW
 
+# Горячие запросы - константы модуля: один и тот же текст SQL попадает
+# в кэш prepared statements asyncpg и прогревается при открытии соединения
+_Q_GET_WEEK_SCHEDULE = """SELECT weekday, is_working, shift1_start, shift1_end,
+        shift2_start, shift2_end
+    FROM work_schedule"""
+_Q_GET_BLOCKED_RANGES = """SELECT id, start_date, end_date, start_time, end_time,
+        reason, blocked_by, created_at, is_recurring
+    FROM blocked_date_ranges
+    WHERE ($1::text IS NULL OR end_date >= $1)
+        AND ($2::text IS NULL OR start_date <= $2)
+    ORDER BY start_date, start_time"""
+_Q_IS_DATE_BLOCKED = """SELECT reason FROM blocked_date_ranges
+    WHERE start_date <= $1 AND end_date >= $1
+        AND (start_time IS NULL OR ($2 >= start_time AND $2 < end_time))
+    ORDER BY (start_time IS NULL) DESC
+    LIMIT 1"""
+
+_Q_BLOCK_ENVELOPE = """SELECT MIN(start_date) AS first_date, MAX(end_date) AS last_date
+    FROM blocked_date_ranges"""
+
+db_adapter.register_warmup_queries(
+    _Q_GET_WEEK_SCHEDULE, _Q_IS_DATE_BLOCKED, _Q_BLOCK_ENVELOPE
+)
+
 
 class CalendarRepository:
     """Репозиторий для управления календарем
-    
+
     ✅ FIXED: Использует db_adapter вместо aiosqlite
     """
 
+    # Кэш недельного расписания: (schedule, expiry по time.monotonic()).
+    # Читается почти в каждом запросе на запись, меняется только админом.
+    # TTL - чтобы другие процессы тоже обновлялись.
+    _SCHEDULE_CACHE_TTL = 60
+    _schedule_cache: Optional[Tuple[Dict[int, Dict], float]] = None
+
+    # Границы всех блокировок: ((min start_date, max end_date), expiry).
+    # Дата вне границ заведомо не заблокирована - is_date_blocked отвечает
+    # без запроса к БД. (None, None) - блокировок нет совсем.
+    _BLOCK_ENVELOPE_TTL = 60
+    _block_envelope: Optional[Tuple[Tuple[Optional[str], Optional[str]], float]] = None
+
+    # === РАСПИСАНИЕ ПО ДНЯМ НЕДЕЛИ ===
+
+    @classmethod
+    async def get_week_schedule(cls) -> Dict[int, Dict]:
+        """Получить расписание на неделю (с кэшем)
+
+        Returns:
+            Dict[weekday, {is_working, shift1_start, shift1_end,
+                           shift2_start, shift2_end}], weekday: 0 = понедельник
+        """
+        cached = cls._schedule_cache
+        if cached is not None and time.monotonic() < cached[1]:
+            return cached[0]
+
+        try:
+            rows = await db_adapter.fetch(_Q_GET_WEEK_SCHEDULE)
+            schedule = {row.pop("weekday"): row for row in rows}
+            cls._schedule_cache = (schedule, time.monotonic() + cls._SCHEDULE_CACHE_TTL)
+            return schedule
+        except Exception as e:
+            logging.error(f"Error getting week schedule: {e}")
+            return {}
+
+    @classmethod
+    async def set_weekday_schedule(
+        cls,
+        weekday: int,
+        is_working: bool,
+        shift1_start: str = None,
+        shift1_end: str = None,
+        shift2_start: str = None,
+        shift2_end: str = None,
+    ) -> bool:
+        """Установить расписание для дня недели (0 = понедельник)
+
+        UPSERT обновляет строку на месте; если расписание не изменилось,
+        WHERE ... IS DISTINCT FROM пропускает запись новой версии строки.
+        """
+        try:
+            await db_adapter.execute(
+                """INSERT INTO work_schedule
+                (weekday, is_working, shift1_start, shift1_end, shift2_start, shift2_end)
+                VALUES ($1, $2, $3, $4, $5, $6)
+                ON CONFLICT (weekday) DO UPDATE SET
+                    is_working = EXCLUDED.is_working,
+                    shift1_start = EXCLUDED.shift1_start,
+                    shift1_end = EXCLUDED.shift1_end,
+                    shift2_start = EXCLUDED.shift2_start,
+                    shift2_end = EXCLUDED.shift2_end,
+                    updated_at = NOW()
+                WHERE (work_schedule.is_working, work_schedule.shift1_start,
+                       work_schedule.shift1_end, work_schedule.shift2_start,
+                       work_schedule.shift2_end)
+                    IS DISTINCT FROM
+                      (EXCLUDED.is_working, EXCLUDED.shift1_start, EXCLUDED.shift1_end,
+                       EXCLUDED.shift2_start, EXCLUDED.shift2_end)""",
+                weekday, is_working, shift1_start, shift1_end, shift2_start, shift2_end
+            )
+            cls._schedule_cache = None
+            logging.info(f"Schedule for weekday {weekday} updated")
+            return True
+        except Exception as e:
+            logging.error(f"Error setting schedule for weekday {weekday}: {e}")
+            return False
+
+    @classmethod
+    async def get_working_hours_for_date(cls, check_date: str) -> Optional[Dict]:
+        """Получить рабочие смены на дату из кэшированного расписания
+
+        День недели считается в Python намеренно: расписание уже в памяти,
+        и вынос weekday в SQL вернул бы лишний запрос к БД. Дата разбирается
+        через date.fromisoformat - он заметно быстрее strptime.
+
+        Returns:
+            Расписание дня или None, если для дня недели оно не задано
+        """
+        weekday = date.fromisoformat(check_date).weekday()
+        schedule = await cls.get_week_schedule()
+        return schedule.get(weekday)
+
+    # === БЛОКИРОВКА ДИАПАЗОНОВ ДАТ ===
+
+    @classmethod
+    async def block_date_range(
+        cls,
+        start_date: str,
+        end_date: str,
+        admin_id: int,
+        reason: str = None,
+        start_time: str = None,
+        end_time: str = None,
+        is_recurring: bool = False,
+    ) -> Optional[int]:
+        """Заблокировать диапазон дат
+
+        Args:
+            start_date: Начало диапазона (YYYY-MM-DD)
+            end_date: Конец диапазона включительно (YYYY-MM-DD)
+            admin_id: ID администратора
+            reason: Причина блокировки
+            start_time: Начало блокировки внутри дня (HH:MM), None - весь день
+            end_time: Конец блокировки внутри дня (HH:MM)
+            is_recurring: Повторяющаяся блокировка
+
+        Returns:
+            ID блокировки или None при ошибке
+        """
+        try:
+            block_id = await db_adapter.fetchval(
+                """INSERT INTO blocked_date_ranges
+                (start_date, end_date, start_time, end_time, reason, blocked_by, is_recurring)
+                VALUES ($1, $2, $3, $4, $5, $6, $7)
+                RETURNING id""",
+                start_date, end_date, start_time, end_time, reason, admin_id, is_recurring
+            )
+            cls._block_envelope = None
+            logging.info(
+                f"Date range {start_date} - {end_date} blocked by admin {admin_id} (#{block_id})"
+            )
+            return block_id
+        except Exception as e:
+            logging.error(f"Error blocking date range {start_date} - {end_date}: {e}")
+            return None
+
+    @classmethod
+    async def block_date_ranges_bulk(
+        cls,
+        ranges: List[Tuple[str, str, Optional[str], Optional[str], Optional[str]]],
+        admin_id: int,
+        is_recurring: bool = False,
+    ) -> List[int]:
+        """Заблокировать несколько диапазонов дат одним запросом
+
+        Все строки вставляются одним INSERT ... SELECT FROM unnest(...) - одна
+        транзакция и один round-trip. Используйте вместо цикла из
+        block_date_range() (например, для списка праздников).
+
+        Args:
+            ranges: [(start_date, end_date, start_time, end_time, reason), ...]
+            admin_id: ID администратора
+            is_recurring: Повторяющиеся блокировки
+
+        Returns:
+            ID созданных блокировок в порядке ranges (пустой список при ошибке)
+        """
+        if not ranges:
+            return []
+
+        start_dates, end_dates, start_times, end_times, reasons = (
+            list(column) for column in zip(*ranges)
+        )
+        try:
+            rows = await db_adapter.fetch(
+                """INSERT INTO blocked_date_ranges
+                (start_date, end_date, start_time, end_time, reason, blocked_by, is_recurring)
+                SELECT start_date, end_date, start_time, end_time, reason, $6, $7
+                FROM unnest($1::text[], $2::text[], $3::text[], $4::text[], $5::text[])
+                    WITH ORDINALITY AS r(start_date, end_date, start_time, end_time, reason, n)
+                ORDER BY n
+                RETURNING id""",
+                start_dates, end_dates, start_times, end_times, reasons, admin_id, is_recurring
+            )
+            block_ids = [row["id"] for row in rows]
+            cls._block_envelope = None
+            logging.info(f"{len(block_ids)} date ranges blocked by admin {admin_id}")
+            return block_ids
+        except Exception as e:
+            logging.error(f"Error bulk blocking {len(ranges)} date ranges: {e}")
+            return []
+
+    @classmethod
+    async def unblock_date_range(cls, block_id: int) -> bool:
+        """Снять блокировку диапазона дат"""
+        try:
+            deleted_id = await db_adapter.fetchval(
+                "DELETE FROM blocked_date_ranges WHERE id = $1 RETURNING id",
+                block_id
+            )
+            deleted = deleted_id is not None
+            if deleted:
+                cls._block_envelope = None
+                logging.info(f"Date range block #{block_id} removed")
+            return deleted
+        except Exception as e:
+            logging.error(f"Error unblocking date range #{block_id}: {e}")
+            return False
+
+    @staticmethod
+    async def iter_blocked_ranges(
+        start_date: str = None, end_date: str = None
+    ) -> AsyncIterator[Tuple]:
+        """Потоково перебрать блокировки, пересекающиеся с периодом
+
+        Строки читаются курсором и не собираются в список - для длинных
+        периодов (многолетние админ-отчеты), которые обходятся один раз.
+        Ошибки БД пробрасываются вызывающему.
+
+        Yields:
+            Tuple[id, start_date, end_date, start_time, end_time,
+                  reason, blocked_by, created_at, is_recurring]
+        """
+        async for row in db_adapter.iterate(_Q_GET_BLOCKED_RANGES, start_date, end_date):
+            yield tuple(row.values())
+
     @staticmethod
-    async def init_calendar_tables():
-        """Инициализация таблиц календаря (если нужно)"""
+    async def get_blocked_ranges(
+        start_date: str = None, end_date: str = None
+    ) -> List[Tuple]:
+        """Получить блокировки, пересекающиеся с периодом
+
+        Для коротких периодов один fetch дешевле курсора (без транзакции
+        и дополнительных round-trip); для длинных - iter_blocked_ranges().
+
+        Returns:
+            List[Tuple[id, start_date, end_date, start_time, end_time,
+                       reason, blocked_by, created_at, is_recurring]]
+        """
+        try:
+            rows = await db_adapter.fetch(_Q_GET_BLOCKED_RANGES, start_date, end_date)
+            return [tuple(row.values()) for row in rows]
+        except Exception as e:
+            logging.error(f"Error getting blocked ranges: {e}")
+            return []
+
+    @classmethod
+    async def _get_block_envelope(cls) -> Tuple[Optional[str], Optional[str]]:
+        """Границы всех блокировок (min start_date, max end_date) с кэшем"""
+        cached = cls._block_envelope
+        if cached is not None and time.monotonic() < cached[1]:
+            return cached[0]
+
+        row = await db_adapter.fetchrow(_Q_BLOCK_ENVELOPE)
+        envelope = (row["first_date"], row["last_date"]) if row else (None, None)
+        cls._block_envelope = (envelope, time.monotonic() + cls._BLOCK_ENVELOPE_TTL)
+        return envelope
+
+    @classmethod
+    async def is_date_blocked(
+        cls, check_date: str, check_time: str = None
+    ) -> Tuple[bool, Optional[str]]:
+        """Проверить попадает ли дата (и время) в блокировку
+
+        Сначала дата сверяется с кэшированными границами всех блокировок:
+        вне них (и когда блокировок нет) ответ дается без запроса к БД.
+
+        Иначе один запрос для обоих случаев: при check_time=None условие
+        по времени дает NULL, и учитываются только блокировки на весь день.
+        Блокировки на весь день имеют приоритет при выборе причины.
+
+        Args:
+            check_date: Дата (YYYY-MM-DD)
+            check_time: Время (HH:MM) или None
+
+        Returns:
+            Tuple[is_blocked, reason]
+        """
         try:
-            # Пример дополнительных таблиц для календаря
-            # Если такие таблицы есть, их нужно добавить в SchemaManager
-            logging.info("✅ Calendar tables initialized (placeholder)")
+            first, last = await cls._get_block_envelope()
+            if first is None or check_date < first or check_date > last:
+                return False, None
+
+            row = await db_adapter.fetchrow(_Q_IS_DATE_BLOCKED, check_date, check_time)
+            if row:
+                return True, row["reason"]
+            return False, None
         except Exception as e:
-            logging.error(f"Error initializing calendar tables: {e}")
+            logging.error(f"Error checking blocked date {check_date} {check_time}: {e}")
+            return False, None
@@ -6,8 +6,49 @@
 import logging
 from typing import Dict, List, Optional
 
+from cachetools import TTLCache
+
 from database.db_adapter import db_adapter  # ✅ NEW
 
+_SERVICES_SELECT = """SELECT id, name, COALESCE(description, '') AS description,
+    duration_minutes, COALESCE(price, '—') AS price, is_active
+FROM services"""
+# Отдельный текст для активных - под частичный индекс idx_services_active
+_Q_ACTIVE_SERVICES = f"{_SERVICES_SELECT}\nWHERE is_active = true\nORDER BY id"
+_Q_ALL_SERVICES = f"{_SERVICES_SELECT}\nORDER BY id"
+
+
+class ServicesCache:
+    """In-process кэш справочника услуг
+
+    Таблица services маленькая и почти статичная: вместо LEFT JOIN services
+    в каждом запросе по bookings название/длительность/цена подставляются
+    из этого словаря. Кэш сбрасывается при любом изменении услуг.
+    """
+
+    # Кэш на 5 минут (TTL)
+    _cache: TTLCache = TTLCache(maxsize=1, ttl=300)
+
+    @classmethod
+    async def get_all(cls) -> Dict[int, Dict]:
+        """Получить все услуги (включая неактивные) в виде {id: service}
+
+        Ошибки БД пробрасываются вызывающему коду.
+        """
+        services = cls._cache.get("all")
+        if services is None:
+            rows = await db_adapter.fetch(
+                "SELECT id, name, duration_minutes, price FROM services"
+            )
+            services = {row["id"]: row for row in rows}
+            cls._cache["all"] = services
+        return services
+
+    @classmethod
+    def invalidate(cls):
+        """Сбросить кэш услуг"""
+        cls._cache.clear()
+
 
 class ServiceRepository:
     """Репозиторий для управления услугами
@@ -16,30 +57,15 @@ class ServiceRepository:
     """
 
     @staticmethod
-    async def get_all_services() -> List[Dict]:
-        """Получить все активные услуги"""
+    async def get_all_services(active_only: bool = True) -> List[Dict]:
+        """Получить услуги (по умолчанию - только активные)"""
         try:
+            # Значения по умолчанию подставляет SQL - строки адаптера уже dict
             rows = await db_adapter.fetch(
-                """SELECT id, name, description, duration_minutes, price, is_active
-                FROM services
-                WHERE is_active = true
-                ORDER BY id"""
+                _Q_ACTIVE_SERVICES if active_only else _Q_ALL_SERVICES
             )
             
-            if not rows:
-                return []
-            
-            return [
-                {
-                    "id": row["id"],
-                    "name": row["name"],
-                    "description": row["description"] or "",
-                    "duration_minutes": row["duration_minutes"],
-                    "price": row["price"] or "—",
-                    "is_active": row["is_active"],
-                }
-                for row in rows
-            ]
+            return rows or []
         except Exception as e:
             logging.error(f"Error getting all services: {e}")
             return []
@@ -48,24 +74,13 @@ class ServiceRepository:
     async def get_service_by_id(service_id: int) -> Optional[Dict]:
         """Получить услугу по ID"""
         try:
-            row = await db_adapter.fetchrow(
-                """SELECT id, name, description, duration_minutes, price, is_active
+            return await db_adapter.fetchrow(
+                """SELECT id, name, COALESCE(description, '') AS description,
+                    duration_minutes, COALESCE(price, '—') AS price, is_active
                 FROM services
                 WHERE id = $1""",
                 service_id
             )
-            
-            if not row:
-                return None
-            
-            return {
-                "id": row["id"],
-                "name": row["name"],
-                "description": row["description"] or "",
-                "duration_minutes": row["duration_minutes"],
-                "price": row["price"] or "—",
-                "is_active": row["is_active"],
-            }
         except Exception as e:
             logging.error(f"Error getting service {service_id}: {e}")
             return None
@@ -85,6 +100,7 @@ class ServiceRepository:
                 RETURNING id""",
                 name, description, duration_minutes, price
             )
+            ServicesCache.invalidate()
             logging.info(f"Service created: {service_id} - {name}")
             return service_id
         except Exception as e:
@@ -101,40 +117,25 @@ class ServiceRepository:
     ) -> bool:
         """Обновить услугу"""
         try:
-            updates = []
-            params = []
-            param_num = 1
-            
-            if name is not None:
-                updates.append(f"name = ${param_num}")
-                params.append(name)
-                param_num += 1
-            
-            if description is not None:
-                updates.append(f"description = ${param_num}")
-                params.append(description)
-                param_num += 1
-            
-            if duration_minutes is not None:
-                updates.append(f"duration_minutes = ${param_num}")
-                params.append(duration_minutes)
-                param_num += 1
-            
-            if price is not None:
-                updates.append(f"price = ${param_num}")
-                params.append(price)
-                param_num += 1
-            
-            if not updates:
+            if all(v is None for v in (name, description, duration_minutes, price)):
                 return False
-            
-            params.append(service_id)
-            query = f"UPDATE services SET {', '.join(updates)} WHERE id = ${param_num}"
-            
-            result = await db_adapter.execute(query, *params)
-            updated = "UPDATE 1" in result
+
+            # Один статический UPDATE на любую комбинацию полей: NULL-параметр
+            # оставляет колонку без изменений, план кэшируется по тексту SQL
+            updated_id = await db_adapter.fetchval(
+                """UPDATE services SET
+                    name = COALESCE($1, name),
+                    description = COALESCE($2, description),
+                    duration_minutes = COALESCE($3, duration_minutes),
+                    price = COALESCE($4, price)
+                WHERE id = $5
+                RETURNING id""",
+                name, description, duration_minutes, price, service_id
+            )
+            updated = updated_id is not None
             
             if updated:
+                ServicesCache.invalidate()
                 logging.info(f"Service updated: {service_id}")
             
             return updated
@@ -146,13 +147,14 @@ class ServiceRepository:
     async def delete_service(service_id: int) -> bool:
         """Удалить услугу (мягкое удаление - установка is_active=false)"""
         try:
-            result = await db_adapter.execute(
-                "UPDATE services SET is_active = false WHERE id = $1",
+            deleted_id = await db_adapter.fetchval(
+                "UPDATE services SET is_active = false WHERE id = $1 RETURNING id",
                 service_id
             )
-            deleted = "UPDATE 1" in result
+            deleted = deleted_id is not None
             
             if deleted:
+                ServicesCache.invalidate()
                 logging.info(f"Service deleted (soft): {service_id}")
             
             return deleted
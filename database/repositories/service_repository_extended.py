@@ -3,9 +3,44 @@
 import logging
 from typing import Any
 
-import aiosqlite
-
-from config import DATABASE_PATH
+from database.repositories._conn import get_conn, write_lock
+from database.repositories.service_repository import ServiceRepository, ServicesCache
+
+
+def _reorder_sql(op: str, order: str) -> str:
+    """SQL обмена display_order услуги с ближайшей соседней"""
+    return f"""WITH cur AS (
+        SELECT id, display_order FROM services WHERE id = ?
+    ), neighbor AS (
+        SELECT s.id, s.display_order FROM services s, cur
+        WHERE s.display_order {op} cur.display_order
+        ORDER BY s.display_order {order} LIMIT 1
+    )
+    UPDATE services SET display_order = CASE id
+        WHEN (SELECT id FROM cur) THEN (SELECT display_order FROM neighbor)
+        ELSE (SELECT display_order FROM cur)
+    END
+    WHERE id IN (SELECT id FROM cur UNION ALL SELECT id FROM neighbor)
+        AND EXISTS (SELECT 1 FROM neighbor)
+    RETURNING id"""
+
+
+_REORDER_UP_SQL = _reorder_sql("<", "DESC")
+_REORDER_DOWN_SQL = _reorder_sql(">", "ASC")
+
+# Разрешенные для update_service_field поля -> готовый UPDATE
+_UPDATE_FIELD_SQL = {
+    field: f"UPDATE services SET {field}=? WHERE id=?"
+    for field in (
+        "name",
+        "description",
+        "duration_minutes",
+        "price",
+        "color",
+        "is_active",
+        "display_order",
+    )
+}
 
 
 class ServiceRepositoryExtended:
@@ -23,7 +58,8 @@ class ServiceRepositoryExtended:
     ) -> int:
         """Создать новую услугу (упрощенный интерфейс)"""
         try:
-            async with aiosqlite.connect(DATABASE_PATH) as db:
+            db = await get_conn()
+            async with write_lock:
                 cursor = await db.execute(
                     """INSERT INTO services
                     (name, description, duration_minutes, price, color, display_order, is_active)
@@ -39,9 +75,10 @@ class ServiceRepositoryExtended:
                     ),
                 )
                 await db.commit()
-                service_id = cursor.lastrowid
-                logging.info(f"Created service {service_id}: {name}")
-                return service_id
+            service_id = cursor.lastrowid
+            ServicesCache.invalidate()
+            logging.info(f"Created service {service_id}: {name}")
+            return service_id
         except Exception as e:
             logging.error(f"Error creating service: {e}")
             return 0
@@ -49,34 +86,26 @@ class ServiceRepositoryExtended:
     @staticmethod
     async def update_service_field(service_id: int, field: str, value: Any) -> bool:
         """Обновить одно поле услуги"""
-        valid_fields = {
-            "name",
-            "description",
-            "duration_minutes",
-            "price",
-            "color",
-            "is_active",
-            "display_order",
-        }
-
-        if field not in valid_fields:
-            logging.error(f"Invalid field: {field}")
-            return False
-
-        # Преобразуем duration в правильное поле
+        # Преобразуем duration в правильное поле (до проверки по whitelist)
         if field == "duration":
             field = "duration_minutes"
 
+        query = _UPDATE_FIELD_SQL.get(field)
+        if query is None:
+            logging.error(f"Invalid field: {field}")
+            return False
+
         try:
-            async with aiosqlite.connect(DATABASE_PATH) as db:
-                query = f"UPDATE services SET {field}=? WHERE id=?"
+            db = await get_conn()
+            async with write_lock:
                 cursor = await db.execute(query, (value, service_id))
                 await db.commit()
 
-                success = cursor.rowcount > 0
-                if success:
-                    logging.info(f"Updated service {service_id}, field {field} = {value}")
-                return success
+            success = cursor.rowcount > 0
+            if success:
+                ServicesCache.invalidate()
+                logging.info(f"Updated service {service_id}, field {field} = {value}")
+            return success
         except Exception as e:
             logging.error(f"Error updating service field: {e}")
             return False
@@ -85,7 +114,8 @@ class ServiceRepositoryExtended:
     async def delete_service(service_id: int, hard_delete: bool = False) -> bool:
         """Удалить услугу"""
         try:
-            async with aiosqlite.connect(DATABASE_PATH) as db:
+            db = await get_conn()
+            async with write_lock:
                 if hard_delete:
                     # Полное удаление
                     cursor = await db.execute("DELETE FROM services WHERE id=?", (service_id,))
@@ -94,91 +124,52 @@ class ServiceRepositoryExtended:
                     cursor = await db.execute(
                         "UPDATE services SET is_active=0 WHERE id=?", (service_id,)
                     )
-
                 await db.commit()
-                success = cursor.rowcount > 0
+            success = cursor.rowcount > 0
 
-                if success:
-                    action = "deleted" if hard_delete else "deactivated"
-                    logging.info(f"Service {service_id} {action}")
+            if success:
+                ServicesCache.invalidate()
+                action = "deleted" if hard_delete else "deactivated"
+                logging.info(f"Service {service_id} {action}")
 
-                return success
+            return success
         except Exception as e:
             logging.error(f"Error deleting service: {e}")
             return False
 
     @staticmethod
     async def reorder_service(service_id: int, direction: str) -> bool:
-        """Переместить услугу вверх или вниз"""
-        try:
-            async with aiosqlite.connect(DATABASE_PATH) as db:
-                # Получаем текущий display_order
-                async with db.execute(
-                    "SELECT display_order FROM services WHERE id=?", (service_id,)
-                ) as cursor:
-                    row = await cursor.fetchone()
-                    if not row:
-                        return False
-                    current_order = row[0]
-
-                # Находим соседнюю услугу
-                if direction == "up":
-                    # Находим услугу с меньшим display_order
-                    async with db.execute(
-                        """SELECT id, display_order FROM services
-                        WHERE display_order < ?
-                        ORDER BY display_order DESC LIMIT 1""",
-                        (current_order,),
-                    ) as cursor:
-                        neighbor = await cursor.fetchone()
-                else:  # down
-                    # Находим услугу с большим display_order
-                    async with db.execute(
-                        """SELECT id, display_order FROM services
-                        WHERE display_order > ?
-                        ORDER BY display_order ASC LIMIT 1""",
-                        (current_order,),
-                    ) as cursor:
-                        neighbor = await cursor.fetchone()
-
-                if not neighbor:
-                    return False
-
-                neighbor_id, neighbor_order = neighbor
-
-                # Меняем местами display_order
-                await db.execute(
-                    "UPDATE services SET display_order=? WHERE id=?", (neighbor_order, service_id)
-                )
-                await db.execute(
-                    "UPDATE services SET display_order=? WHERE id=?", (current_order, neighbor_id)
-                )
+        """Переместить услугу вверх или вниз
 
+        Обмен display_order с соседней услугой - один атомарный UPDATE
+        (CTE находит текущую и соседнюю строки), вместо SELECT + SELECT +
+        двух UPDATE.
+        """
+        try:
+            db = await get_conn()
+            query = _REORDER_UP_SQL if direction == "up" else _REORDER_DOWN_SQL
+            async with write_lock:
+                async with db.execute(query, (service_id,)) as cursor:
+                    swapped = await cursor.fetchall()
                 await db.commit()
-                logging.info(f"Service {service_id} moved {direction}")
-                return True
+
+            # Если соседа нет (крайняя позиция) - ничего не обновлено
+            if len(swapped) != 2:
+                return False
+
+            logging.info(f"Service {service_id} moved {direction}")
+            return True
 
         except Exception as e:
             logging.error(f"Error reordering service: {e}")
             return False
 
-    @staticmethod
-    async def get_active_services():
-        """Получить активные услуги - алиас для совместимости"""
-        from database.repositories.service_repository import ServiceRepository
-
-        return await ServiceRepository.get_all_services(active_only=True)
+    # Алиасы для совместимости - прямые ссылки на методы ServiceRepository,
+    # без промежуточной корутины-обертки на каждый вызов
+    get_active_services = staticmethod(ServiceRepository.get_all_services)
+    get_service_by_id = staticmethod(ServiceRepository.get_service_by_id)
 
     @staticmethod
     async def get_all_services():
         """Получить все услуги - алиас для совместимости"""
-        from database.repositories.service_repository import ServiceRepository
-
         return await ServiceRepository.get_all_services(active_only=False)
-
-    @staticmethod
-    async def get_service_by_id(service_id: int):
-        """Получить услугу по ID - алиас для совместимости"""
-        from database.repositories.service_repository import ServiceRepository
-
-        return await ServiceRepository.get_service_by_id(service_id)
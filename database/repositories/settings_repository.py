@@ -4,77 +4,270 @@
 """
 
 import logging
-from typing import Dict, Optional
+import time
+from itertools import chain
+from typing import Dict, Optional, Tuple
 
+from config import WORK_HOURS_END, WORK_HOURS_START
 from database.db_adapter import db_adapter  # ✅ NEW
 from utils.helpers import now_local
 
+# Горячие запросы - константы модуля: один и тот же текст SQL попадает
+# в кэш prepared statements asyncpg и прогревается при открытии соединения
+# Вся таблица (key, value) - переносимый SQL для PostgreSQL и SQLite
+_Q_GET_ALL_SETTINGS = "SELECT key, value FROM settings"
+_Q_SET_SETTING = """INSERT INTO settings (key, value, description, updated_at)
+    VALUES ($1, $2, $3, $4)
+    ON CONFLICT (key) DO UPDATE SET
+        value = EXCLUDED.value,
+        description = EXCLUDED.description,
+        updated_at = EXCLUDED.updated_at"""
+
+db_adapter.register_warmup_queries(_Q_GET_ALL_SETTINGS, _Q_SET_SETTING)
+
+DEFAULT_SLOT_INTERVAL = 60
+
+# Значения по умолчанию: (key, value, description)
+_DEFAULT_SETTINGS = (
+    ("work_hours_start", str(WORK_HOURS_START), "Начало рабочего дня"),
+    ("work_hours_end", str(WORK_HOURS_END), "Конец рабочего дня"),
+    ("slot_interval_minutes", str(DEFAULT_SLOT_INTERVAL), "Интервал между слотами (мин)"),
+)
+
+
+def _values_placeholders(rows: int, columns: int) -> str:
+    """Плейсхолдеры многострочного VALUES: "($1, $2), ($3, $4)"
+
+    Номера идут по порядку и каждый используется один раз - SQLite-ветка
+    db_adapter заменяет $n на ? позиционно.
+    """
+    return ", ".join(
+        "(" + ", ".join(f"${row * columns + col}" for col in range(1, columns + 1)) + ")"
+        for row in range(rows)
+    )
+
+
+# Все значения по умолчанию - одним INSERT; многострочный VALUES и
+# ON CONFLICT DO NOTHING работают и в PostgreSQL, и в SQLite
+_Q_SEED_DEFAULTS = f"""INSERT INTO settings (key, value, description)
+    VALUES {_values_placeholders(len(_DEFAULT_SETTINGS), 3)}
+    ON CONFLICT (key) DO NOTHING"""
+_SEED_DEFAULTS_ARGS = tuple(chain.from_iterable(_DEFAULT_SETTINGS))
+
 
 class SettingsRepository:
     """Репозиторий для управления настройками
-    
+
     ✅ FIXED: Использует db_adapter вместо aiosqlite
     """
 
-    @staticmethod
-    async def init_settings_table():
-        """Инициализация таблицы settings (уже создана в SchemaManager)"""
+    # Кэш всех настроек: ({key: value}, expiry по time.monotonic()).
+    # Таблица маленькая и меняется редко - один SELECT заполняет кэш для
+    # всех геттеров. Свои записи обновляют кэш на месте, TTL - чтобы
+    # другие процессы увидели изменение без отдельной инвалидации.
+    _SETTINGS_CACHE_TTL = 30
+    _settings_cache: Optional[Tuple[Dict[str, str], float]] = None
+    # Числовые настройки расписания (начало, конец, интервал), разобранные
+    # из кэша один раз - горячий путь рендера слотов не вызывает int()
+    _schedule_config: Optional[Tuple[int, int, int]] = None
+
+    @classmethod
+    async def init_settings_table(cls):
+        """Инициализация таблицы settings (сама таблица создана в SchemaManager)
+
+        Все значения из _DEFAULT_SETTINGS вставляются одним запросом без
+        предварительного COUNT(*)/get_setting: ON CONFLICT DO NOTHING
+        пропускает уже существующие ключи, поэтому повторный/одновременный
+        старт безопасен. Затем кэш настроек заполняется заранее - первые
+        запросы после старта не ждут БД и не гонятся за его заполнением.
+        """
         try:
-            logging.info("✅ Settings table initialized (already created by SchemaManager)")
+            await db_adapter.execute(_Q_SEED_DEFAULTS, *_SEED_DEFAULTS_ARGS)
+            await cls._load_all()
+            logging.info("✅ Settings table initialized")
         except Exception as e:
             logging.error(f"Error initializing settings table: {e}")
 
-    @staticmethod
-    async def get_setting(key: str) -> Optional[str]:
+    # === КЭШ ===
+
+    @classmethod
+    async def _load_all(cls) -> Dict[str, str]:
+        """Все настройки из кэша (при промахе - один SELECT всей таблицы)
+
+        Ошибки БД пробрасываются вызывающему коду.
+        """
+        cached = cls._settings_cache
+        if cached is not None and time.monotonic() < cached[1]:
+            return cached[0]
+
+        rows = await db_adapter.fetch(_Q_GET_ALL_SETTINGS)
+        # Строка - пара (key, value) в порядке колонок: без обращения по имени
+        settings = dict(row.values() for row in rows)
+        cls._settings_cache = (settings, time.monotonic() + cls._SETTINGS_CACHE_TTL)
+        cls._schedule_config = None
+        return settings
+
+    @classmethod
+    async def _load_schedule_config(cls) -> Tuple[int, int, int]:
+        """(начало, конец, интервал) из кэша, разбор строк - один раз на загрузку
+
+        Ошибки БД пробрасываются вызывающему коду.
+        """
+        settings = await cls._load_all()
+        config = cls._schedule_config
+        if config is None:
+            config = (
+                int(settings.get("work_hours_start", WORK_HOURS_START)),
+                int(settings.get("work_hours_end", WORK_HOURS_END)),
+                int(settings.get("slot_interval_minutes", DEFAULT_SLOT_INTERVAL)),
+            )
+            cls._schedule_config = config
+        return config
+
+    @classmethod
+    def _update_cache(cls, values: Dict[str, Optional[str]]) -> None:
+        """Применить записанные значения к кэшу (None - ключ удален)"""
+        cls._schedule_config = None
+        if cls._settings_cache is None:
+            return
+        settings = cls._settings_cache[0]
+        for key, value in values.items():
+            if value is None:
+                settings.pop(key, None)
+            else:
+                settings[key] = value
+
+    # === ОБЩИЕ НАСТРОЙКИ ===
+
+    @classmethod
+    async def get_setting(cls, key: str) -> Optional[str]:
         """Получить значение настройки"""
         try:
-            value = await db_adapter.fetchval(
-                "SELECT value FROM settings WHERE key = $1",
-                key
-            )
-            return value
+            settings = await cls._load_all()
+            return settings.get(key)
         except Exception as e:
             logging.error(f"Error getting setting {key}: {e}")
             return None
 
-    @staticmethod
-    async def set_setting(key: str, value: str, description: str = "") -> bool:
+    @classmethod
+    async def set_setting(cls, key: str, value: str, description: str = "") -> bool:
         """Установить значение настройки"""
         try:
             # PostgreSQL UPSERT
+            await db_adapter.execute(_Q_SET_SETTING, key, value, description, now_local())
+            cls._update_cache({key: value})
+            logging.info(f"Setting updated: {key} = {value}")
+            return True
+        except Exception as e:
+            logging.error(f"Error setting {key}: {e}")
+            return False
+
+    @classmethod
+    async def set_settings(cls, values: Dict[str, str]) -> bool:
+        """Установить несколько настроек одним UPSERT
+
+        Все пары пишутся одним INSERT ... VALUES (...), (...): один
+        round-trip и одна транзакция вместо вызова set_setting() на ключ.
+        Описание существующих настроек не меняется, неизменившиеся
+        значения не перезаписываются.
+        """
+        if not values:
+            return True
+
+        # NULL-безопасное "не равно": IS DISTINCT FROM - PostgreSQL, IS NOT - SQLite
+        distinct = "IS NOT" if db_adapter.db_type == "sqlite" else "IS DISTINCT FROM"
+        updated_at = now_local()
+        args = []
+        for key, value in values.items():
+            args.extend((key, value, updated_at))
+
+        try:
             await db_adapter.execute(
-                """INSERT INTO settings (key, value, description, updated_at)
-                VALUES ($1, $2, $3, $4)
+                f"""INSERT INTO settings (key, value, updated_at)
+                VALUES {_values_placeholders(len(values), 3)}
                 ON CONFLICT (key) DO UPDATE SET
                     value = EXCLUDED.value,
-                    description = EXCLUDED.description,
-                    updated_at = EXCLUDED.updated_at""",
-                key, value, description, now_local()
+                    updated_at = EXCLUDED.updated_at
+                WHERE settings.value {distinct} EXCLUDED.value""",
+                *args
             )
-            logging.info(f"Setting updated: {key} = {value}")
+            cls._update_cache(values)
+            logging.info(f"Settings updated: {values}")
             return True
         except Exception as e:
-            logging.error(f"Error setting {key}: {e}")
+            logging.error(f"Error setting {list(values)}: {e}")
             return False
 
-    @staticmethod
-    async def get_all_settings() -> Dict[str, str]:
-        """Получить все настройки"""
+    @classmethod
+    async def get_all_settings(cls) -> Dict[str, str]:
+        """Получить все настройки (копия - кэш не меняется снаружи)"""
         try:
-            rows = await db_adapter.fetch(
-                "SELECT key, value FROM settings"
-            )
-            
-            if not rows:
-                return {}
-            
-            return {row["key"]: row["value"] for row in rows}
+            settings = await cls._load_all()
+            return dict(settings)
         except Exception as e:
             logging.error(f"Error getting all settings: {e}")
             return {}
 
-    @staticmethod
-    async def delete_setting(key: str) -> bool:
+    # === РАБОЧИЕ ЧАСЫ ===
+
+    @classmethod
+    async def get_work_hours(cls) -> Tuple[int, int]:
+        """Получить рабочие часы (начало, конец)
+
+        Если в settings значений нет - используются WORK_HOURS_* из config.
+        """
+        try:
+            start_hour, end_hour, _ = await cls._load_schedule_config()
+            return start_hour, end_hour
+        except Exception as e:
+            logging.error(f"Error getting work hours: {e}")
+            return WORK_HOURS_START, WORK_HOURS_END
+
+    @classmethod
+    async def update_work_hours(cls, start_hour: int, end_hour: int) -> bool:
+        """Обновить рабочие часы (обе настройки - одним set_settings)"""
+        updated = await cls.set_settings(
+            {"work_hours_start": str(start_hour), "work_hours_end": str(end_hour)}
+        )
+        if updated:
+            logging.info(f"Work hours updated: {start_hour}:00 - {end_hour}:00")
+        return updated
+
+    # === ИНТЕРВАЛ СЛОТОВ ===
+
+    @classmethod
+    async def get_slot_interval(cls) -> int:
+        """Получить интервал между слотами в минутах"""
+        try:
+            config = await cls._load_schedule_config()
+            return config[2]
+        except Exception as e:
+            logging.error(f"Error getting slot interval: {e}")
+            return DEFAULT_SLOT_INTERVAL
+
+    @classmethod
+    async def get_schedule_config(cls) -> Tuple[int, int, int]:
+        """Получить (начало, конец, интервал слотов) за одно обращение
+
+        Для экранов, которым нужны и рабочие часы, и сетка слотов: одно
+        чтение кэша настроек (при промахе - один SELECT) вместо двух
+        вызовов get_work_hours() и get_slot_interval().
+        """
+        try:
+            return await cls._load_schedule_config()
+        except Exception as e:
+            logging.error(f"Error getting schedule config: {e}")
+            return WORK_HOURS_START, WORK_HOURS_END, DEFAULT_SLOT_INTERVAL
+
+    @classmethod
+    async def update_slot_interval(cls, interval_minutes: int) -> bool:
+        """Обновить интервал между слотами (минуты)"""
+        return await cls.set_setting(
+            "slot_interval_minutes", str(interval_minutes), "Интервал между слотами (мин)"
+        )
+
+    @classmethod
+    async def delete_setting(cls, key: str) -> bool:
         """Удалить настройку"""
         try:
             result = await db_adapter.execute(
@@ -82,10 +275,11 @@ class SettingsRepository:
                 key
             )
             deleted = "DELETE 1" in result
-            
+
             if deleted:
+                cls._update_cache({key: None})
                 logging.info(f"Setting deleted: {key}")
-            
+
             return deleted
         except Exception as e:
             logging.error(f"Error deleting setting {key}: {e}")
@@ -5,11 +5,32 @@
 
 import logging
 from datetime import datetime
-from typing import List, Optional, Tuple
+from typing import AsyncIterator, List, Optional, Tuple
 
 from database.db_adapter import db_adapter  # ✅ NEW
 from utils.helpers import now_local
 
+# Горячие запросы - константы модуля: один и тот же текст SQL попадает
+# в кэш prepared statements asyncpg и прогревается при открытии соединения
+_Q_REGISTER_USER = """INSERT INTO users (user_id, first_seen) VALUES ($1, $2)
+    ON CONFLICT (user_id) DO NOTHING
+    RETURNING user_id"""
+_Q_GET_ALL_USERS = "SELECT user_id FROM users"
+_Q_USERS_PAGE = "SELECT user_id FROM users WHERE user_id > $1 ORDER BY user_id LIMIT $2"
+_Q_COUNT_USERS = "SELECT COUNT(*) FROM users"
+_Q_FAVORITE_SLOTS = """SELECT time, service_id
+    FROM bookings
+    WHERE user_id = $1
+    GROUP BY time, service_id
+    ORDER BY COUNT(*) DESC
+    LIMIT 1"""
+
+db_adapter.register_warmup_queries(
+    _Q_REGISTER_USER, _Q_GET_ALL_USERS, _Q_USERS_PAGE, _Q_COUNT_USERS, _Q_FAVORITE_SLOTS
+)
+
+_USERS_PAGE_SIZE = 1000
+
 
 class UserRepository:
     """Репозиторий для управления пользователями
@@ -19,19 +40,16 @@ class UserRepository:
 
     @staticmethod
     async def is_new_user(user_id: int) -> bool:
-        """Проверить новый ли пользователь"""
+        """Проверить новый ли пользователь (и зарегистрировать нового)
+
+        Один INSERT ... ON CONFLICT DO NOTHING RETURNING вместо
+        SELECT EXISTS + INSERT: строка вернулась - пользователь только что
+        добавлен. Нет гонки между проверкой и вставкой.
+        """
         try:
-            exists = await db_adapter.fetchval(
-                "SELECT EXISTS(SELECT 1 FROM users WHERE user_id=$1)",
-                user_id
-            )
-            
-            if not exists:
-                # Добавляем нового пользователя
-                await db_adapter.execute(
-                    "INSERT INTO users (user_id, first_seen) VALUES ($1, $2)",
-                    user_id, now_local()
-                )
+            inserted = await db_adapter.fetchval(_Q_REGISTER_USER, user_id, now_local())
+
+            if inserted is not None:
                 logging.info(f"New user registered: {user_id}")
                 return True
             return False
@@ -43,17 +61,35 @@ class UserRepository:
     async def get_all_users() -> List[int]:
         """Получить всех пользователей"""
         try:
-            rows = await db_adapter.fetch("SELECT user_id FROM users")
-            return [row["user_id"] for row in rows] if rows else []
+            return await db_adapter.fetchcol(_Q_GET_ALL_USERS)
         except Exception as e:
             logging.error(f"Error getting all users: {e}")
             return []
 
+    @staticmethod
+    async def iter_all_users(page_size: int = _USERS_PAGE_SIZE) -> AsyncIterator[int]:
+        """Потоково перебрать ID всех пользователей
+
+        Страницы по page_size читаются keyset-пагинацией по первичному ключу
+        (user_id > последний). В памяти только одна страница, и соединение
+        не удерживается между страницами - в отличие от серверного курсора,
+        который держал бы транзакцию все время медленной рассылки.
+        Ошибки БД пробрасываются вызывающему.
+        """
+        last_id = -1
+        while True:
+            user_ids = await db_adapter.fetchcol(_Q_USERS_PAGE, last_id, page_size)
+            for user_id in user_ids:
+                yield user_id
+            if len(user_ids) < page_size:
+                return
+            last_id = user_ids[-1]
+
     @staticmethod
     async def get_total_users_count() -> int:
         """Получить количество пользователей"""
         try:
-            count = await db_adapter.fetchval("SELECT COUNT(*) FROM users")
+            count = await db_adapter.fetchval(_Q_COUNT_USERS)
             return count or 0
         except Exception as e:
             logging.error(f"Error getting total users count: {e}")
@@ -63,18 +99,10 @@ class UserRepository:
     async def get_favorite_slots(user_id: int) -> Tuple[Optional[str], Optional[int]]:
         """Получить любимое время и услугу"""
         try:
-            row = await db_adapter.fetchrow(
-                """SELECT time, service_id, COUNT(*) as cnt
-                FROM bookings
-                WHERE user_id = $1
-                GROUP BY time, service_id
-                ORDER BY cnt DESC
-                LIMIT 1""",
-                user_id
-            )
-            
+            row = await db_adapter.fetchrow(_Q_FAVORITE_SLOTS, user_id)
+
             if row:
-                return (row["time"], row["service_id"])
+                return tuple(row.values())
             return (None, None)
         except Exception as e:
             logging.error(f"Error getting favorite slots for user {user_id}: {e}")
@@ -11,14 +11,224 @@ Examples:
     >>> # ✅ Все таблицы созданы в client_001
 """
 
+import asyncio
 import logging
-from typing import List
+from typing import List, Optional, Set
 
 from database.db_adapter import db_adapter
 
 logger = logging.getLogger(__name__)
 
 
+# DDL-шаблоны с плейсхолдером {schema}: собираются один раз при импорте,
+# на каждую schema остается только str.format
+_SCHEMA_DDL_TEMPLATE = "CREATE SCHEMA IF NOT EXISTS {schema}"
+
+_TABLE_DDL_TEMPLATES = (
+    # Users
+    """CREATE TABLE IF NOT EXISTS {schema}.users (
+        user_id BIGINT PRIMARY KEY,
+        username TEXT,
+        first_name TEXT,
+        last_name TEXT,
+        phone TEXT,
+        first_seen TIMESTAMP DEFAULT NOW(),
+        created_at TIMESTAMP DEFAULT NOW()
+    )""",
+
+    # Services
+    """CREATE TABLE IF NOT EXISTS {schema}.services (
+        id SERIAL PRIMARY KEY,
+        name TEXT NOT NULL,
+        description TEXT,
+        duration_minutes INTEGER NOT NULL DEFAULT 60,
+        price TEXT,
+        is_active BOOLEAN DEFAULT TRUE,
+        created_at TIMESTAMP DEFAULT NOW()
+    )""",
+
+    # Bookings
+    """CREATE TABLE IF NOT EXISTS {schema}.bookings (
+        id SERIAL PRIMARY KEY,
+        user_id BIGINT NOT NULL,
+        username TEXT,
+        date TEXT NOT NULL,
+        time TEXT NOT NULL,
+        -- Без FK: BookingService проверяет услугу перед вставкой,
+        -- а услуги удаляются мягко (is_active = FALSE)
+        service_id INTEGER,
+        duration_minutes INTEGER DEFAULT 60,
+        status TEXT DEFAULT 'active',
+        created_at TIMESTAMP DEFAULT NOW(),
+        updated_at TIMESTAMP DEFAULT NOW(),
+        CONSTRAINT bookings_date_time_unique UNIQUE (date, time)
+    )""",
+
+    # Admins
+    """CREATE TABLE IF NOT EXISTS {schema}.admins (
+        user_id BIGINT PRIMARY KEY,
+        username TEXT,
+        role TEXT DEFAULT 'moderator',
+        added_by BIGINT,
+        added_at TIMESTAMP DEFAULT NOW()
+    )""",
+
+    # Blocked slots
+    """CREATE TABLE IF NOT EXISTS {schema}.blocked_slots (
+        id SERIAL PRIMARY KEY,
+        date TEXT NOT NULL,
+        time TEXT NOT NULL,
+        reason TEXT,
+        blocked_by BIGINT NOT NULL,
+        blocked_at TIMESTAMP DEFAULT NOW(),
+        CONSTRAINT blocked_slots_date_time_unique UNIQUE (date, time)
+    )""",
+
+    # Blocked date ranges (отпуск, праздники)
+    """CREATE TABLE IF NOT EXISTS {schema}.blocked_date_ranges (
+        id SERIAL PRIMARY KEY,
+        start_date TEXT NOT NULL,
+        end_date TEXT NOT NULL,
+        start_time TEXT,
+        end_time TEXT,
+        reason TEXT,
+        blocked_by BIGINT NOT NULL,
+        created_at TIMESTAMP DEFAULT NOW(),
+        is_recurring BOOLEAN DEFAULT FALSE
+    )""",
+
+    # Work schedule (рабочие смены по дням недели, 0 = понедельник)
+    """CREATE TABLE IF NOT EXISTS {schema}.work_schedule (
+        weekday INTEGER PRIMARY KEY CHECK (weekday >= 0 AND weekday <= 6),
+        is_working BOOLEAN NOT NULL DEFAULT TRUE,
+        shift1_start TEXT,
+        shift1_end TEXT,
+        shift2_start TEXT,
+        shift2_end TEXT,
+        updated_at TIMESTAMP DEFAULT NOW()
+    )""",
+
+    # Analytics
+    """CREATE TABLE IF NOT EXISTS {schema}.analytics (
+        id SERIAL PRIMARY KEY,
+        user_id BIGINT NOT NULL,
+        event TEXT NOT NULL,
+        data TEXT,
+        timestamp TIMESTAMP DEFAULT NOW()
+    )""",
+
+    # Feedback
+    """CREATE TABLE IF NOT EXISTS {schema}.feedback (
+        id SERIAL PRIMARY KEY,
+        user_id BIGINT NOT NULL,
+        booking_id INTEGER,
+        rating INTEGER NOT NULL CHECK (rating >= 1 AND rating <= 5),
+        comment TEXT,
+        timestamp TIMESTAMP DEFAULT NOW()
+    )""",
+
+    # Admin sessions
+    """CREATE TABLE IF NOT EXISTS {schema}.admin_sessions (
+        user_id BIGINT PRIMARY KEY,
+        message_id INTEGER,
+        updated_at TIMESTAMP DEFAULT NOW()
+    )""",
+
+    # Audit log
+    """CREATE TABLE IF NOT EXISTS {schema}.audit_log (
+        id SERIAL PRIMARY KEY,
+        admin_id BIGINT NOT NULL,
+        action TEXT NOT NULL,
+        target_id TEXT,
+        details TEXT,
+        timestamp TIMESTAMP DEFAULT NOW()
+    )""",
+
+    # Booking history
+    """CREATE TABLE IF NOT EXISTS {schema}.booking_history (
+        id SERIAL PRIMARY KEY,
+        booking_id INTEGER NOT NULL,
+        changed_by BIGINT NOT NULL,
+        changed_by_type TEXT NOT NULL,
+        action TEXT NOT NULL,
+        old_date TEXT,
+        old_time TEXT,
+        new_date TEXT,
+        new_time TEXT,
+        old_service_id INTEGER,
+        new_service_id INTEGER,
+        reason TEXT,
+        changed_at TIMESTAMP DEFAULT NOW()
+    )""",
+
+    # Settings
+    """CREATE TABLE IF NOT EXISTS {schema}.settings (
+        key TEXT PRIMARY KEY,
+        value TEXT,
+        description TEXT,
+        updated_at TIMESTAMP DEFAULT NOW()
+    )""",
+
+    # Text templates (i18n)
+    """CREATE TABLE IF NOT EXISTS {schema}.text_templates (
+        id SERIAL PRIMARY KEY,
+        key TEXT NOT NULL UNIQUE,
+        text TEXT NOT NULL,
+        description TEXT,
+        updated_at TIMESTAMP DEFAULT NOW()
+    )""",
+)
+
+_INDEX_DDL_TEMPLATES = (
+    # Bookings indexes
+    "CREATE INDEX IF NOT EXISTS idx_bookings_date ON {schema}.bookings(date, time)",
+    # Покрывающий: get_favorite_slots - index-only scan и агрегация
+    # в порядке индекса; префикс user_id заменяет idx_bookings_user
+    # (старый индекс в существующих schemas удаляет миграция v010)
+    """CREATE INDEX IF NOT EXISTS idx_bookings_user_time_svc
+        ON {schema}.bookings(user_id, time, service_id)""",
+    "CREATE INDEX IF NOT EXISTS idx_bookings_service ON {schema}.bookings(service_id)",
+    "CREATE INDEX IF NOT EXISTS idx_bookings_status ON {schema}.bookings(status)",
+    "CREATE INDEX IF NOT EXISTS idx_bookings_created ON {schema}.bookings(created_at)",
+
+    # Analytics indexes
+    "CREATE INDEX IF NOT EXISTS idx_analytics_user ON {schema}.analytics(user_id, event)",
+    "CREATE INDEX IF NOT EXISTS idx_analytics_timestamp ON {schema}.analytics(timestamp)",
+
+    # Blocked slots indexes
+    "CREATE INDEX IF NOT EXISTS idx_blocked_date ON {schema}.blocked_slots(date, time)",
+    # Покрывающий: is_date_blocked / get_blocked_ranges - index-only scan
+    """CREATE INDEX IF NOT EXISTS idx_blocked_ranges_cover ON {schema}.blocked_date_ranges(start_date, end_date)
+        INCLUDE (start_time, end_time, reason, id, blocked_by, created_at, is_recurring)""",
+
+    # Feedback indexes
+    "CREATE INDEX IF NOT EXISTS idx_feedback_timestamp ON {schema}.feedback(timestamp)",
+    "CREATE INDEX IF NOT EXISTS idx_feedback_user ON {schema}.feedback(user_id)",
+
+    # Services indexes
+    # Частичный: get_all_services читает только активные услуги в порядке id
+    "CREATE INDEX IF NOT EXISTS idx_services_active ON {schema}.services(id) WHERE is_active = TRUE",
+
+    # Admins indexes
+    "CREATE INDEX IF NOT EXISTS idx_admins_added ON {schema}.admins(added_at)",
+
+    # Audit log indexes
+    "CREATE INDEX IF NOT EXISTS idx_audit_admin ON {schema}.audit_log(admin_id)",
+    "CREATE INDEX IF NOT EXISTS idx_audit_action ON {schema}.audit_log(action)",
+    "CREATE INDEX IF NOT EXISTS idx_audit_timestamp ON {schema}.audit_log(timestamp)",
+
+    # Booking history indexes
+    "CREATE INDEX IF NOT EXISTS idx_booking_history_booking ON {schema}.booking_history(booking_id)",
+    "CREATE INDEX IF NOT EXISTS idx_booking_history_changed_by ON {schema}.booking_history(changed_by)",
+    "CREATE INDEX IF NOT EXISTS idx_booking_history_timestamp ON {schema}.booking_history(changed_at)",
+)
+
+# Весь DDL одним скриптом для _execute_ddl_batch
+_ALL_DDL_TEMPLATE = ";\n".join(
+    (_SCHEMA_DDL_TEMPLATE, *_TABLE_DDL_TEMPLATES, *_INDEX_DDL_TEMPLATES)
+)
+
+
 class SchemaManager:
     """
     Менеджер схем PostgreSQL
@@ -29,232 +239,181 @@ class SchemaManager:
     - Создание индексов
     """
 
-    @staticmethod
-    async def init_schema(schema_name: str) -> None:
+    # Имена существующих schemas: меняются только при provisioning,
+    # поэтому schema_exists отвечает из памяти после первой загрузки
+    _schema_cache: Optional[Set[str]] = None
+    _cache_lock = asyncio.Lock()
+
+    @classmethod
+    async def init_schema(cls, schema_name: str) -> None:
         """
         Инициализация schema с таблицами и индексами
-        
+
+        Весь DDL (schema, таблицы, индексы) отправляется одним
+        multi-statement запросом внутри одной транзакции: один round-trip
+        и один сброс WAL вместо ~30 отдельных autocommit-запросов. При
+        ошибке транзакция откатывается целиком.
+
         Args:
             schema_name: Имя schema (например, "client_001")
         """
         logger.info(f"📦 Initializing schema: {schema_name}")
-        
-        # 1. Создать schema
-        await SchemaManager._create_schema(schema_name)
-        
-        # 2. Создать таблицы
-        await SchemaManager._create_tables(schema_name)
-        
-        # 3. Создать индексы
-        await SchemaManager._create_indexes(schema_name)
-        
-        logger.info(f"✅ Schema {schema_name} initialized successfully")
+
+        await cls._execute_ddl_batch(
+            [schema_name], _ALL_DDL_TEMPLATE.format(schema=schema_name)
+        )
+
+        if cls._schema_cache is not None:
+            cls._schema_cache.add(schema_name)
+        logger.info(
+            f"✅ Schema {schema_name} initialized successfully "
+            f"({len(_TABLE_DDL_TEMPLATES)} tables, {len(_INDEX_DDL_TEMPLATES)} indexes)"
+        )
+
+    @classmethod
+    async def bulk_init(cls, schema_names: List[str], concurrency: int = 4) -> None:
+        """
+        Инициализация нескольких schemas параллельно
+
+        Имена делятся на concurrency групп. Каждая группа отправляется
+        одним multi-statement скриптом на своем соединении пула, а группы
+        выполняются одновременно через asyncio.gather. Для N schemas это
+        concurrency round-trip'ов вместо N последовательных init_schema().
+        Ошибка в группе откатывает только ее schemas.
+
+        Args:
+            schema_names: Имена schemas
+            concurrency: Число одновременно используемых соединений
+                (не больше размера пула)
+        """
+        if not schema_names:
+            return
+
+        workers = max(1, min(concurrency, len(schema_names)))
+        chunks = [schema_names[i::workers] for i in range(workers)]
+        logger.info(f"📦 Initializing {len(schema_names)} schemas on {workers} connections")
+
+        results = await asyncio.gather(
+            *(
+                cls._execute_ddl_batch(
+                    chunk,
+                    ";\n".join(_ALL_DDL_TEMPLATE.format(schema=name) for name in chunk),
+                )
+                for chunk in chunks
+            ),
+            return_exceptions=True,
+        )
+
+        failed = []
+        for chunk, result in zip(chunks, results):
+            if isinstance(result, BaseException):
+                failed.extend(chunk)
+            elif cls._schema_cache is not None:
+                cls._schema_cache.update(chunk)
+
+        if failed:
+            raise RuntimeError(f"Schema initialization failed for: {', '.join(failed)}")
+        logger.info(f"✅ {len(schema_names)} schemas initialized successfully")
 
     @staticmethod
-    async def _create_schema(schema_name: str) -> None:
-        """Создать schema если не существует"""
-        await db_adapter.execute(f"CREATE SCHEMA IF NOT EXISTS {schema_name}")
-        logger.info(f"  ✅ Schema created: {schema_name}")
+    async def _execute_ddl_batch(schema_names: List[str], batch_sql: str) -> None:
+        """Выполнить DDL-скрипт одним запросом в одной транзакции
+
+        Без параметров asyncpg использует simple query protocol, который
+        допускает несколько statements через ";".
+
+        Args:
+            schema_names: Schemas, которые создает скрипт (для диагностики)
+            batch_sql: DDL-скрипт
+        """
+        try:
+            async with db_adapter.acquire() as conn:
+                async with conn.transaction():
+                    await conn.execute(batch_sql)
+        except Exception as e:
+            logger.error(
+                f"❌ Schema {', '.join(schema_names)} DDL batch failed, rolled back: {e}"
+            )
+            for schema_name in schema_names:
+                await SchemaManager._locate_failed_ddl(schema_name)
+            raise
 
     @staticmethod
-    async def _create_tables(schema_name: str) -> None:
-        """Создать все таблицы в schema"""
-        tables = [
-            # Users
-            f"""CREATE TABLE IF NOT EXISTS {schema_name}.users (
-                user_id BIGINT PRIMARY KEY,
-                username TEXT,
-                first_name TEXT,
-                last_name TEXT,
-                phone TEXT,
-                first_seen TIMESTAMP DEFAULT NOW(),
-                created_at TIMESTAMP DEFAULT NOW()
-            )""",
-            
-            # Services
-            f"""CREATE TABLE IF NOT EXISTS {schema_name}.services (
-                id SERIAL PRIMARY KEY,
-                name TEXT NOT NULL,
-                description TEXT,
-                duration_minutes INTEGER NOT NULL DEFAULT 60,
-                price TEXT,
-                is_active BOOLEAN DEFAULT TRUE,
-                created_at TIMESTAMP DEFAULT NOW()
-            )""",
-            
-            # Bookings
-            f"""CREATE TABLE IF NOT EXISTS {schema_name}.bookings (
-                id SERIAL PRIMARY KEY,
-                user_id BIGINT NOT NULL,
-                username TEXT,
-                date TEXT NOT NULL,
-                time TEXT NOT NULL,
-                service_id INTEGER REFERENCES {schema_name}.services(id),
-                duration_minutes INTEGER DEFAULT 60,
-                status TEXT DEFAULT 'active',
-                created_at TIMESTAMP DEFAULT NOW(),
-                updated_at TIMESTAMP DEFAULT NOW(),
-                CONSTRAINT bookings_date_time_unique UNIQUE (date, time)
-            )""",
-            
-            # Admins
-            f"""CREATE TABLE IF NOT EXISTS {schema_name}.admins (
-                user_id BIGINT PRIMARY KEY,
-                username TEXT,
-                role TEXT DEFAULT 'moderator',
-                added_by BIGINT,
-                added_at TIMESTAMP DEFAULT NOW()
-            )""",
-            
-            # Blocked slots
-            f"""CREATE TABLE IF NOT EXISTS {schema_name}.blocked_slots (
-                id SERIAL PRIMARY KEY,
-                date TEXT NOT NULL,
-                time TEXT NOT NULL,
-                reason TEXT,
-                blocked_by BIGINT NOT NULL,
-                blocked_at TIMESTAMP DEFAULT NOW(),
-                CONSTRAINT blocked_slots_date_time_unique UNIQUE (date, time)
-            )""",
-            
-            # Analytics
-            f"""CREATE TABLE IF NOT EXISTS {schema_name}.analytics (
-                id SERIAL PRIMARY KEY,
-                user_id BIGINT NOT NULL,
-                event TEXT NOT NULL,
-                data TEXT,
-                timestamp TIMESTAMP DEFAULT NOW()
-            )""",
-            
-            # Feedback
-            f"""CREATE TABLE IF NOT EXISTS {schema_name}.feedback (
-                id SERIAL PRIMARY KEY,
-                user_id BIGINT NOT NULL,
-                booking_id INTEGER,
-                rating INTEGER NOT NULL CHECK (rating >= 1 AND rating <= 5),
-                comment TEXT,
-                timestamp TIMESTAMP DEFAULT NOW()
-            )""",
-            
-            # Admin sessions
-            f"""CREATE TABLE IF NOT EXISTS {schema_name}.admin_sessions (
-                user_id BIGINT PRIMARY KEY,
-                message_id INTEGER,
-                updated_at TIMESTAMP DEFAULT NOW()
-            )""",
-            
-            # Audit log
-            f"""CREATE TABLE IF NOT EXISTS {schema_name}.audit_log (
-                id SERIAL PRIMARY KEY,
-                admin_id BIGINT NOT NULL,
-                action TEXT NOT NULL,
-                target_id TEXT,
-                details TEXT,
-                timestamp TIMESTAMP DEFAULT NOW()
-            )""",
-            
-            # Booking history
-            f"""CREATE TABLE IF NOT EXISTS {schema_name}.booking_history (
-                id SERIAL PRIMARY KEY,
-                booking_id INTEGER NOT NULL,
-                changed_by BIGINT NOT NULL,
-                changed_by_type TEXT NOT NULL,
-                action TEXT NOT NULL,
-                old_date TEXT,
-                old_time TEXT,
-                new_date TEXT,
-                new_time TEXT,
-                old_service_id INTEGER,
-                new_service_id INTEGER,
-                reason TEXT,
-                changed_at TIMESTAMP DEFAULT NOW()
-            )""",
-            
-            # Settings
-            f"""CREATE TABLE IF NOT EXISTS {schema_name}.settings (
-                key TEXT PRIMARY KEY,
-                value TEXT,
-                description TEXT,
-                updated_at TIMESTAMP DEFAULT NOW()
-            )""",
-            
-            # Text templates (i18n)
-            f"""CREATE TABLE IF NOT EXISTS {schema_name}.text_templates (
-                id SERIAL PRIMARY KEY,
-                key TEXT NOT NULL UNIQUE,
-                text TEXT NOT NULL,
-                description TEXT,
-                updated_at TIMESTAMP DEFAULT NOW()
-            )""",
+    async def _locate_failed_ddl(schema_name: str) -> None:
+        """Найти statement, на котором упал DDL-скрипт (только для лога)
+
+        Ошибка multi-statement запроса не говорит, какой statement упал.
+        Statements повторяются по одному в транзакции, которая всегда
+        откатывается, - schema остается нетронутой.
+        """
+        statements = [
+            SchemaManager._create_schema(schema_name),
+            *SchemaManager._create_tables(schema_name),
+            *SchemaManager._create_indexes(schema_name),
         ]
-        
-        for table_sql in tables:
-            await db_adapter.execute(table_sql)
-        
-        logger.info(f"  ✅ Created {len(tables)} tables")
+        try:
+            async with db_adapter.acquire() as conn:
+                tr = conn.transaction()
+                await tr.start()
+                try:
+                    for ddl in statements:
+                        try:
+                            await conn.execute(ddl)
+                        except Exception as e:
+                            sqlstate = getattr(e, "sqlstate", None)
+                            first_line = ddl.strip().splitlines()[0]
+                            logger.error(
+                                f"❌ Schema {schema_name} failed DDL "
+                                f"[SQLSTATE {sqlstate}]: {first_line}"
+                            )
+                            return
+                finally:
+                    await tr.rollback()
+        except Exception as e:
+            logger.error(f"Error locating failed DDL for {schema_name}: {e}")
 
     @staticmethod
-    async def _create_indexes(schema_name: str) -> None:
-        """Создать индексы для производительности"""
-        indexes = [
-            # Bookings indexes
-            f"CREATE INDEX IF NOT EXISTS idx_bookings_date ON {schema_name}.bookings(date, time)",
-            f"CREATE INDEX IF NOT EXISTS idx_bookings_user ON {schema_name}.bookings(user_id)",
-            f"CREATE INDEX IF NOT EXISTS idx_bookings_service ON {schema_name}.bookings(service_id)",
-            f"CREATE INDEX IF NOT EXISTS idx_bookings_status ON {schema_name}.bookings(status)",
-            f"CREATE INDEX IF NOT EXISTS idx_bookings_created ON {schema_name}.bookings(created_at)",
-            
-            # Analytics indexes
-            f"CREATE INDEX IF NOT EXISTS idx_analytics_user ON {schema_name}.analytics(user_id, event)",
-            f"CREATE INDEX IF NOT EXISTS idx_analytics_timestamp ON {schema_name}.analytics(timestamp)",
-            
-            # Blocked slots indexes
-            f"CREATE INDEX IF NOT EXISTS idx_blocked_date ON {schema_name}.blocked_slots(date, time)",
-            
-            # Feedback indexes
-            f"CREATE INDEX IF NOT EXISTS idx_feedback_timestamp ON {schema_name}.feedback(timestamp)",
-            f"CREATE INDEX IF NOT EXISTS idx_feedback_user ON {schema_name}.feedback(user_id)",
-            
-            # Admins indexes
-            f"CREATE INDEX IF NOT EXISTS idx_admins_added ON {schema_name}.admins(added_at)",
-            
-            # Audit log indexes
-            f"CREATE INDEX IF NOT EXISTS idx_audit_admin ON {schema_name}.audit_log(admin_id)",
-            f"CREATE INDEX IF NOT EXISTS idx_audit_action ON {schema_name}.audit_log(action)",
-            f"CREATE INDEX IF NOT EXISTS idx_audit_timestamp ON {schema_name}.audit_log(timestamp)",
-            
-            # Booking history indexes
-            f"CREATE INDEX IF NOT EXISTS idx_booking_history_booking ON {schema_name}.booking_history(booking_id)",
-            f"CREATE INDEX IF NOT EXISTS idx_booking_history_changed_by ON {schema_name}.booking_history(changed_by)",
-            f"CREATE INDEX IF NOT EXISTS idx_booking_history_timestamp ON {schema_name}.booking_history(changed_at)",
-        ]
-        
-        for index_sql in indexes:
-            await db_adapter.execute(index_sql)
-        
-        logger.info(f"  ✅ Created {len(indexes)} indexes")
+    def _create_schema(schema_name: str) -> str:
+        """DDL создания schema если не существует"""
+        return _SCHEMA_DDL_TEMPLATE.format(schema=schema_name)
+
+    @staticmethod
+    def _create_tables(schema_name: str) -> List[str]:
+        """DDL всех таблиц schema"""
+        return [ddl.format(schema=schema_name) for ddl in _TABLE_DDL_TEMPLATES]
 
     @staticmethod
-    async def schema_exists(schema_name: str) -> bool:
+    def _create_indexes(schema_name: str) -> List[str]:
+        """DDL индексов для производительности"""
+        return [ddl.format(schema=schema_name) for ddl in _INDEX_DDL_TEMPLATES]
+
+    @classmethod
+    async def schema_exists(cls, schema_name: str) -> bool:
         """
         Проверить существование schema
-        
+
+        Первый вызов загружает имена всех schemas одним запросом, дальше
+        проверка идет по кэшу (сбрасывается через invalidate_cache()).
+
         Args:
             schema_name: Имя schema
-            
+
         Returns:
             True если schema существует
         """
-        result = await db_adapter.fetchval(
-            """
-            SELECT EXISTS(
-                SELECT 1 FROM information_schema.schemata 
-                WHERE schema_name = $1
-            )
-            """,
-            schema_name
-        )
-        return result
+        if cls._schema_cache is None:
+            async with cls._cache_lock:
+                if cls._schema_cache is None:
+                    names = await db_adapter.fetchcol(
+                        "SELECT schema_name FROM information_schema.schemata"
+                    )
+                    cls._schema_cache = set(names)
+        return schema_name in cls._schema_cache
+
+    @classmethod
+    def invalidate_cache(cls) -> None:
+        """Сбросить кэш schemas (например, после удаления schema вручную)"""
+        cls._schema_cache = None
 
     @staticmethod
     async def list_schemas() -> List[str]:
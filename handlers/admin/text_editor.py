@@ -1,6 +1,9 @@
 """Admin Text Editor - UI для редактирования текстов бота"""
 
+import html
 import logging
+from functools import lru_cache
+from string import Template
 from typing import Dict, List
 
 from aiogram import F, Router
@@ -13,6 +16,115 @@ from services.text_manager import HybridTextManager
 
 router = Router()
 
+# Префиксы callback_data: ключ берется срезом по длине префикса,
+# без split() и промежуточного списка на каждый callback
+_PREFIX_TEXTS_CAT = "texts_cat:"
+_PREFIX_TEXT_EDIT = "text_edit:"
+_PREFIX_TEXT_RESET = "text_reset:"
+_PREFIX_TEXT_RESET_CONFIRM = "text_reset_confirm:"
+
+_CATEGORY_NAMES = {
+    "common": "Общие",
+    "booking": "Бронирование",
+    "my_bookings": "Мои записи",
+    "feedback": "Отзывы",
+    "admin": "Админка",
+    "onboarding": "Онбординг",
+}
+
+# Заголовок главного меню - и для нового сообщения, и для возврата в меню
+_TEXT_EDITOR_HEADER = (
+    "📝 <b>Редактор текстов бота</b>\n\n"
+    "Выберите категорию для редактирования:\n\n"
+    "💡 <i>Тексты можно редактировать без перезапуска бота</i>"
+)
+
+# Шаблоны сообщений (HTML). Подставляемые ключи и тексты экранируются
+# html.escape: админ видит исходник текста с разметкой как есть, а
+# "<" или незакрытый тег в тексте не ломает разбор HTML в Telegram
+_CATEGORY_TEMPLATE = Template(
+    "📝 <b>Категория: $name</b>\n\n"
+    "Найдено текстов: $count\n\n"
+    "📄 - дефолтный текст (из YAML)\n"
+    "✏️ - кастомизированный (из БД)"
+)
+_EDIT_TEMPLATE = Template(
+    "📝 <b>Редактирование текста</b>\n\n"
+    "Ключ: <code>$key</code>\n\n"
+    "<b>Текущий текст:</b>\n$text\n\n"
+    "<i>Отправьте новый текст сообщением:</i>"
+)
+_SAVED_TEMPLATE = Template(
+    "✅ <b>Текст успешно обновлен!</b>\n\n"
+    "Ключ: <code>$key</code>\n\n"
+    "<b>Новый текст:</b>\n$text"
+)
+_RESET_CONFIRM_TEMPLATE = Template(
+    "⚠️ <b>Сброс к дефолтному значению</b>\n\n"
+    "Ключ: <code>$key</code>\n\n"
+    "Текст будет сброшен к значению из YAML файла.\n"
+    "Продолжить?"
+)
+_RESET_DONE_TEMPLATE = Template(
+    "✅ <b>Текст сброшен к дефолтному значению!</b>\n\n"
+    "Ключ: <code>$key</code>\n\n"
+    "<b>Текущий текст:</b>\n$text"
+)
+
+
+# Статичные клавиатуры собираются один раз при импорте: хендлеры не
+# создают и не валидируют pydantic-модели кнопок на каждое сообщение
+_MAIN_MENU_KEYBOARD = InlineKeyboardMarkup(
+    inline_keyboard=[
+        [
+            InlineKeyboardButton(text="📋 Общие", callback_data="texts_cat:common"),
+            InlineKeyboardButton(text="📅 Бронирование", callback_data="texts_cat:booking"),
+        ],
+        [
+            InlineKeyboardButton(
+                text="📋 Мои записи", callback_data="texts_cat:my_bookings"
+            ),
+            InlineKeyboardButton(text="💬 Отзывы", callback_data="texts_cat:feedback"),
+        ],
+        [
+            InlineKeyboardButton(
+                text="👨‍💼 Админка", callback_data="texts_cat:admin"
+            ),
+            InlineKeyboardButton(text="👋 Онбординг", callback_data="texts_cat:onboarding"),
+        ],
+        [
+            InlineKeyboardButton(
+                text="🔄 Перезагрузить YAML", callback_data="texts_reload_yaml"
+            ),
+            InlineKeyboardButton(text="🧹 Очистить кэш", callback_data="texts_clear_cache"),
+        ],
+        [InlineKeyboardButton(text="⬅️ Назад", callback_data="admin_menu")],
+    ]
+)
+
+_CANCEL_KEYBOARD = InlineKeyboardMarkup(
+    inline_keyboard=[
+        [InlineKeyboardButton(text="📝 Главное меню", callback_data="texts_menu")]
+    ]
+)
+
+
+@lru_cache(maxsize=32)
+def _back_to_category_keyboard(category: str, with_menu: bool = False) -> InlineKeyboardMarkup:
+    """Клавиатура возврата к категории (кэш по категории)"""
+    rows = [
+        [
+            InlineKeyboardButton(
+                text="⬅️ К категории", callback_data=f"{_PREFIX_TEXTS_CAT}{category}"
+            )
+        ]
+    ]
+    if with_menu:
+        rows.append(
+            [InlineKeyboardButton(text="📝 Главное меню", callback_data="texts_menu")]
+        )
+    return InlineKeyboardMarkup(inline_keyboard=rows)
+
 
 class TextEditorStates(StatesGroup):
     """Состояния для редактирования текстов"""
@@ -28,40 +140,7 @@ class TextEditorStates(StatesGroup):
 @router.message(F.text == "📝 Редактор текстов")
 async def text_editor_menu(message: Message):
     """Главное меню редактора текстов"""
-    keyboard = InlineKeyboardMarkup(
-        inline_keyboard=[
-            [
-                InlineKeyboardButton(text="📋 Общие", callback_data="texts_cat:common"),
-                InlineKeyboardButton(text="📅 Бронирование", callback_data="texts_cat:booking"),
-            ],
-            [
-                InlineKeyboardButton(
-                    text="📋 Мои записи", callback_data="texts_cat:my_bookings"
-                ),
-                InlineKeyboardButton(text="💬 Отзывы", callback_data="texts_cat:feedback"),
-            ],
-            [
-                InlineKeyboardButton(
-                    text="👨‍💼 Админка", callback_data="texts_cat:admin"
-                ),
-                InlineKeyboardButton(text="👋 Онбординг", callback_data="texts_cat:onboarding"),
-            ],
-            [
-                InlineKeyboardButton(
-                    text="🔄 Перезагрузить YAML", callback_data="texts_reload_yaml"
-                ),
-                InlineKeyboardButton(text="🧹 Очистить кэш", callback_data="texts_clear_cache"),
-            ],
-            [InlineKeyboardButton(text="⬅️ Назад", callback_data="admin_menu")],
-        ]
-    )
-
-    await message.answer(
-        "📝 <b>Редактор текстов бота</b>\n\n"
-        "Выберите категорию для редактирования:\n\n"
-        "💡 <i>Тексты можно редактировать без перезапуска бота</i>",
-        reply_markup=keyboard,
-    )
+    await message.answer(_TEXT_EDITOR_HEADER, reply_markup=_MAIN_MENU_KEYBOARD)
 
 
 # ========================================
@@ -69,13 +148,13 @@ async def text_editor_menu(message: Message):
 # ========================================
 
 
-@router.callback_query(F.data.startswith("texts_cat:"))
+@router.callback_query(F.data.startswith(_PREFIX_TEXTS_CAT))
 async def show_category_texts(callback: CallbackQuery):
     """Показать тексты выбранной категории"""
-    category = callback.data.split(":")[1]
+    category = callback.data[len(_PREFIX_TEXTS_CAT):]
 
-    # Получаем все тексты категории
-    texts = await HybridTextManager.get_all(category=category)
+    # Для списка нужны только ключи и статус - без тел текстов
+    texts = await HybridTextManager.get_category_keys(category)
 
     if not texts:
         await callback.answer("⚠️ Тексты не найдены в этой категории", show_alert=True)
@@ -84,14 +163,13 @@ async def show_category_texts(callback: CallbackQuery):
     # Формируем список текстов с кнопками
     keyboard = []
 
-    for key, (text, is_custom) in sorted(texts.items()):
-        # Обрезаем длинный текст для отображения
-        display_text = text[:50] + "..." if len(text) > 50 else text
+    # get_category_keys() отдает ключи уже в порядке сортировки
+    for key, is_custom in texts:
         status = "✏️" if is_custom else "📄"
 
-        button_text = f"{status} {key.split('.')[-1]}"
+        button_text = f"{status} {key.rpartition('.')[2]}"
         keyboard.append(
-            [InlineKeyboardButton(text=button_text, callback_data=f"text_edit:{key}")]
+            [InlineKeyboardButton(text=button_text, callback_data=f"{_PREFIX_TEXT_EDIT}{key}")]
         )
 
     # Кнопка "Назад"
@@ -99,20 +177,10 @@ async def show_category_texts(callback: CallbackQuery):
 
     markup = InlineKeyboardMarkup(inline_keyboard=keyboard)
 
-    category_names = {
-        "common": "Общие",
-        "booking": "Бронирование",
-        "my_bookings": "Мои записи",
-        "feedback": "Отзывы",
-        "admin": "Админка",
-        "onboarding": "Онбординг",
-    }
-
     await callback.message.edit_text(
-        f"📝 <b>Категория: {category_names.get(category, category)}</b>\n\n"
-        f"Найдено текстов: {len(texts)}\n\n"
-        f"📄 - дефолтный текст (из YAML)\n"
-        f"✏️ - кастомизированный (из БД)",
+        _CATEGORY_TEMPLATE.substitute(
+            name=html.escape(_CATEGORY_NAMES.get(category, category)), count=len(texts)
+        ),
         reply_markup=markup,
     )
 
@@ -124,10 +192,10 @@ async def show_category_texts(callback: CallbackQuery):
 # ========================================
 
 
-@router.callback_query(F.data.startswith("text_edit:"))
+@router.callback_query(F.data.startswith(_PREFIX_TEXT_EDIT))
 async def edit_text_start(callback: CallbackQuery, state: FSMContext):
     """Начать редактирование текста"""
-    key = callback.data.split(":", 1)[1]
+    key = callback.data[len(_PREFIX_TEXT_EDIT):]
 
     # Получаем текущий текст
     current_text = await HybridTextManager.get(key)
@@ -140,7 +208,7 @@ async def edit_text_start(callback: CallbackQuery, state: FSMContext):
         inline_keyboard=[
             [
                 InlineKeyboardButton(
-                    text="🔄 Сбросить к дефолту", callback_data=f"text_reset:{key}"
+                    text="🔄 Сбросить к дефолту", callback_data=f"{_PREFIX_TEXT_RESET}{key}"
                 )
             ],
             [InlineKeyboardButton(text="❌ Отмена", callback_data="texts_cancel_edit")],
@@ -148,10 +216,7 @@ async def edit_text_start(callback: CallbackQuery, state: FSMContext):
     )
 
     await callback.message.edit_text(
-        f"📝 <b>Редактирование текста</b>\n\n"
-        f"Ключ: <code>{key}</code>\n\n"
-        f"<b>Текущий текст:</b>\n{current_text}\n\n"
-        f"<i>Отправьте новый текст сообщением:</i>",
+        _EDIT_TEMPLATE.substitute(key=html.escape(key), text=html.escape(current_text)),
         reply_markup=keyboard,
     )
 
@@ -177,24 +242,13 @@ async def save_new_text(message: Message, state: FSMContext):
     )
 
     if success:
-        keyboard = InlineKeyboardMarkup(
-            inline_keyboard=[
-                [
-                    InlineKeyboardButton(
-                        text="⬅️ К категории", callback_data=f"texts_cat:{key.split('.')[0]}"
-                    )
-                ],
-                [InlineKeyboardButton(text="📝 Главное меню", callback_data="texts_menu")],
-            ]
-        )
+        keyboard = _back_to_category_keyboard(key.partition(".")[0], with_menu=True)
 
         # Превью нового текста
         preview = new_text[:200] + "..." if len(new_text) > 200 else new_text
 
         await message.answer(
-            f"✅ <b>Текст успешно обновлен!</b>\n\n"
-            f"Ключ: <code>{key}</code>\n\n"
-            f"<b>Новый текст:</b>\n{preview}",
+            _SAVED_TEMPLATE.substitute(key=html.escape(key), text=html.escape(preview)),
             reply_markup=keyboard,
         )
 
@@ -210,39 +264,36 @@ async def save_new_text(message: Message, state: FSMContext):
 # ========================================
 
 
-@router.callback_query(F.data.startswith("text_reset:"))
+@router.callback_query(F.data.startswith(_PREFIX_TEXT_RESET))
 async def reset_text_confirm(callback: CallbackQuery):
     """Подтверждение сброса к дефолту"""
-    key = callback.data.split(":", 1)[1]
+    key = callback.data[len(_PREFIX_TEXT_RESET):]
 
     keyboard = InlineKeyboardMarkup(
         inline_keyboard=[
             [
                 InlineKeyboardButton(
-                    text="✅ Да, сбросить", callback_data=f"text_reset_confirm:{key}"
+                    text="✅ Да, сбросить", callback_data=f"{_PREFIX_TEXT_RESET_CONFIRM}{key}"
                 ),
                 InlineKeyboardButton(
-                    text="❌ Отмена", callback_data=f"text_edit:{key}"
+                    text="❌ Отмена", callback_data=f"{_PREFIX_TEXT_EDIT}{key}"
                 ),
             ]
         ]
     )
 
     await callback.message.edit_text(
-        f"⚠️ <b>Сброс к дефолтному значению</b>\n\n"
-        f"Ключ: <code>{key}</code>\n\n"
-        f"Текст будет сброшен к значению из YAML файла.\n"
-        f"Продолжить?",
+        _RESET_CONFIRM_TEMPLATE.substitute(key=html.escape(key)),
         reply_markup=keyboard,
     )
 
     await callback.answer()
 
 
-@router.callback_query(F.data.startswith("text_reset_confirm:"))
+@router.callback_query(F.data.startswith(_PREFIX_TEXT_RESET_CONFIRM))
 async def reset_text_execute(callback: CallbackQuery):
     """Выполнить сброс к дефолту"""
-    key = callback.data.split(":", 1)[1]
+    key = callback.data[len(_PREFIX_TEXT_RESET_CONFIRM):]
 
     success = await HybridTextManager.reset_to_default(key)
 
@@ -251,24 +302,15 @@ async def reset_text_execute(callback: CallbackQuery):
         default_text = await HybridTextManager.get(key)
         preview = default_text[:200] + "..." if len(default_text) > 200 else default_text
 
-        keyboard = InlineKeyboardMarkup(
-            inline_keyboard=[
-                [
-                    InlineKeyboardButton(
-                        text="⬅️ К категории", callback_data=f"texts_cat:{key.split('.')[0]}"
-                    )
-                ]
-            ]
-        )
+        keyboard = _back_to_category_keyboard(key.partition(".")[0])
 
         await callback.message.edit_text(
-            f"✅ <b>Текст сброшен к дефолтному значению!</b>\n\n"
-            f"Ключ: <code>{key}</code>\n\n"
-            f"<b>Текущий текст:</b>\n{preview}",
+            _RESET_DONE_TEMPLATE.substitute(key=html.escape(key), text=html.escape(preview)),
             reply_markup=keyboard,
         )
 
         logging.info(f"Text reset to default by admin {callback.from_user.id}: {key}")
+        await callback.answer()
     else:
         await callback.answer("❌ Ошибка при сбросе текста", show_alert=True)
 
@@ -299,14 +341,8 @@ async def cancel_edit(callback: CallbackQuery, state: FSMContext):
     """Отменить редактирование"""
     await state.clear()
 
-    keyboard = InlineKeyboardMarkup(
-        inline_keyboard=[
-            [InlineKeyboardButton(text="📝 Главное меню", callback_data="texts_menu")]
-        ]
-    )
-
     await callback.message.edit_text(
-        "❌ Редактирование отменено", reply_markup=keyboard
+        "❌ Редактирование отменено", reply_markup=_CANCEL_KEYBOARD
     )
     await callback.answer()
 
@@ -258,21 +258,24 @@ async def broadcast_execute(message: Message, state: FSMContext):
         return
 
     broadcast_text = message.text
-    user_ids = await Database.get_all_users()
+    total_users = await Database.get_total_users_count()
 
-    await message.answer(f"📤 Начинаю рассылку {len(user_ids)} пользователям...")
+    await message.answer(f"📤 Начинаю рассылку {total_users} пользователям...")
 
     success_count = 0
     fail_count = 0
 
-    for user_id in user_ids:
-        try:
-            await message.bot.send_message(user_id, broadcast_text)
-            await asyncio.sleep(BROADCAST_DELAY)
-            success_count += 1
-        except Exception as e:
-            logging.error(f"Broadcast failed for user_id={user_id}: {e}")
-            fail_count += 1
+    try:
+        async for user_id in Database.iter_all_users():
+            try:
+                await message.bot.send_message(user_id, broadcast_text)
+                await asyncio.sleep(BROADCAST_DELAY)
+                success_count += 1
+            except Exception as e:
+                logging.error(f"Broadcast failed for user_id={user_id}: {e}")
+                fail_count += 1
+    except Exception as e:
+        logging.error(f"Broadcast interrupted: failed to load users: {e}")
 
     await state.clear()
     await message.answer(
@@ -1,101 +1,121 @@
 """Обработчики для управления администраторами"""
 
+import asyncio
 import logging
 
 from aiogram import F, Router
 from aiogram.fsm.context import FSMContext
 from aiogram.types import CallbackQuery, InlineKeyboardButton, InlineKeyboardMarkup, Message
 
-from config import ADMIN_IDS, ROLE_MODERATOR, ROLE_SUPER_ADMIN
+from config import (
+    ADMIN_IDS,
+    ADMIN_IDS_SET,
+    MAX_ADMIN_ADDITIONS_PER_HOUR,
+    ROLE_MODERATOR,
+    ROLE_SUPER_ADMIN,
+)
 from database.queries import Database
 from database.repositories.audit_repository import AuditRepository
 from keyboards.admin_keyboards import ADMIN_MENU
-from utils.helpers import is_admin
-from utils.permissions import get_admin_role_display, has_permission
+from utils.helpers import is_admin, split_callback_data
+from utils.permissions import format_role_badge, get_admin_role_display, has_permission
 from utils.rate_limiter import AdminRateLimiter
 from utils.states import AdminStates
 
 router = Router()
 
+# Текст меню управления админами (общий для входа в меню и возврата в него)
+_ADMIN_MENU_TEMPLATE = (
+    "👥 УПРАВЛЕНИЕ АДМИНИСТРАТОРАМИ\n\n"
+    "🔑 Статические (.env): {static}\n"
+    "💾 Динамические (БД): {dynamic}\n"
+    "👥 Всего: {total}\n\n"
+    "Выберите действие:"
+)
+
+# Статичные клавиатуры собираются один раз при импорте
+_ADMIN_MENU_KB = InlineKeyboardMarkup(
+    inline_keyboard=[
+        [InlineKeyboardButton(text="📋 Список админов", callback_data="list_admins")],
+        [InlineKeyboardButton(text="➕ Добавить админа", callback_data="add_admin_start")],
+        [InlineKeyboardButton(text="➖ Удалить админа", callback_data="remove_admin_start")],
+        # ✅ NEW: Управление ролями
+        [InlineKeyboardButton(text="🔄 Изменить роль", callback_data="change_role_start")],
+    ]
+)
+
+_BACK_TO_ADMIN_MENU_BUTTON = InlineKeyboardButton(
+    text="🔙 Назад", callback_data="back_to_admin_menu"
+)
+_BACK_TO_ADMIN_MENU_KB = InlineKeyboardMarkup(inline_keyboard=[[_BACK_TO_ADMIN_MENU_BUTTON]])
+
+
+def _admin_menu_text(admin_count: int) -> str:
+    """Текст меню управления админами для admin_count админов из БД"""
+    static_count = len(ADMIN_IDS)
+    return _ADMIN_MENU_TEMPLATE.format(
+        static=static_count, dynamic=admin_count, total=static_count + admin_count
+    )
+
 
 @router.message(F.text == "👥 Администраторы")
 async def admin_management_menu(message: Message):
     """Меню управления администраторами"""
-    if not is_admin(message.from_user.id):
+    # Проверка доступа и счетчик - независимые запросы, выполняются параллельно
+    allowed, admin_count = await asyncio.gather(
+        is_admin(message.from_user.id), Database.get_admin_count()
+    )
+    if not allowed:
         await message.answer("❌ Нет доступа")
         return
 
-    kb = InlineKeyboardMarkup(
-        inline_keyboard=[
-            [InlineKeyboardButton(text="📋 Список админов", callback_data="list_admins")],
-            [InlineKeyboardButton(text="➕ Добавить админа", callback_data="add_admin_start")],
-            [InlineKeyboardButton(text="➖ Удалить админа", callback_data="remove_admin_start")],
-            # ✅ NEW: Управление ролями
-            [InlineKeyboardButton(text="🔄 Изменить роль", callback_data="change_role_start")],
-        ]
-    )
-
-    admin_count = await Database.get_admin_count()
-    total_admins = len(ADMIN_IDS) + admin_count
-
-    await message.answer(
-        f"👥 УПРАВЛЕНИЕ АДМИНИСТРАТОРАМИ\n\n"
-        f"🔑 Статические (.env): {len(ADMIN_IDS)}\n"
-        f"💾 Динамические (БД): {admin_count}\n"
-        f"👥 Всего: {total_admins}\n\n"
-        "Выберите действие:",
-        reply_markup=kb,
-    )
+    await message.answer(_admin_menu_text(admin_count), reply_markup=_ADMIN_MENU_KB)
 
 
 @router.callback_query(F.data == "list_admins")
 async def list_admins(callback: CallbackQuery):
     """Список всех администраторов"""
-    if not is_admin(callback.from_user.id):
+    allowed, db_admins = await asyncio.gather(
+        is_admin(callback.from_user.id), Database.get_all_admins()
+    )
+    if not allowed:
         await callback.answer("❌ Нет доступа", show_alert=True)
         return
 
-    text = "📋 СПИСОК АДМИНИСТРАТОРОВ\n\n"
+    # Строки собираются в список и склеиваются один раз
+    parts = ["📋 СПИСОК АДМИНИСТРАТОРОВ\n", "🔑 Статические (.env):"]
 
-    # Статические админы из .env
-    text += "🔑 Статические (.env):\n"
-    for admin_id in ADMIN_IDS:
-        user_link = f"<a href='tg://user?id={admin_id}'>{admin_id}</a>"
-        role_badge = await get_admin_role_display(admin_id)
-        text += f"  • {user_link} {role_badge}\n"
-    text += "\n"
-
-    # Динамические админы из БД
-    db_admins = await Database.get_all_admins()
+    # Статические админы из .env - всегда Super Admin
+    static_badge = format_role_badge(ROLE_SUPER_ADMIN)
+    parts.extend(
+        f"  • <a href='tg://user?id={admin_id}'>{admin_id}</a> {static_badge}"
+        for admin_id in ADMIN_IDS
+    )
+    parts.append("")
 
+    # Динамические админы из БД (роль уже есть в строке - без запроса на админа)
     if db_admins:
-        text += "💾 Динамические (БД):\n"
+        parts.append("💾 Динамические (БД):")
         for user_id, username, added_by, added_at, role in db_admins:
             user_link = f"<a href='tg://user?id={user_id}'>{user_id}</a>"
             username_display = f"@{username}" if username else "нет username"
-            role_badge = await get_admin_role_display(user_id)
-            text += f"  • {user_link} ({username_display}) {role_badge}\n"
-            text += f"    🔹 Добавлен: {added_at[:16]}\n"
-        text += "\n"
+            parts.append(f"  • {user_link} ({username_display}) {format_role_badge(role)}")
+            parts.append(f"    🔹 Добавлен: {added_at[:16]}")
+        parts.append("")
     else:
-        text += "💾 Динамические: нет\n\n"
-
-    text += "ℹ️ Статические админы нельзя удалить через бота"
+        parts.append("💾 Динамические: нет\n")
 
-    kb = InlineKeyboardMarkup(
-        inline_keyboard=[
-            [InlineKeyboardButton(text="🔙 Назад", callback_data="back_to_admin_menu")]
-        ]
-    )
+    parts.append("ℹ️ Статические админы нельзя удалить через бота")
+    text = "\n".join(parts)
 
-    await callback.message.edit_text(text, reply_markup=kb, parse_mode="HTML")
+    await callback.message.edit_text(text, reply_markup=_BACK_TO_ADMIN_MENU_KB, parse_mode="HTML")
     await callback.answer()
 
 
 @router.callback_query(F.data == "add_admin_start")
 async def add_admin_start(callback: CallbackQuery, state: FSMContext):
     """Начало добавления админа"""
-    if not is_admin(callback.from_user.id):
+    if not await is_admin(callback.from_user.id):
         await callback.answer("❌ Нет доступа", show_alert=True)
         return
 
@@ -108,8 +128,6 @@ async def add_admin_start(callback: CallbackQuery, state: FSMContext):
     can_add, count, minutes = await AdminRateLimiter.can_add_admin(callback.from_user.id)
 
     if not can_add:
-        from config import MAX_ADMIN_ADDITIONS_PER_HOUR
-
         await callback.answer(
             f"❌ ЛИМИТ ДОСТИГНУТ\n\n"
             f"Вы добавили {count} админов.\n"
@@ -135,7 +153,7 @@ async def add_admin_start(callback: CallbackQuery, state: FSMContext):
 @router.message(AdminStates.awaiting_new_admin_id)
 async def add_admin_process(message: Message, state: FSMContext):
     """Обработка добавления админа"""
-    if not is_admin(message.from_user.id):
+    if not await is_admin(message.from_user.id):
         await state.clear()
         return
 
@@ -159,7 +177,7 @@ async def add_admin_process(message: Message, state: FSMContext):
         return
 
     # Проверка что не уже админ
-    if new_admin_id in ADMIN_IDS:
+    if new_admin_id in ADMIN_IDS_SET:
         await state.clear()
         await message.answer(
             "⚠️ Этот пользователь уже статический админ (.env)",
@@ -167,20 +185,26 @@ async def add_admin_process(message: Message, state: FSMContext):
         )
         return
 
-    is_already_admin = await Database.is_admin_in_db(new_admin_id)
+    # Проверка в БД и запрос username в Telegram независимы - выполняются
+    # параллельно: задержка = max(БД, Telegram API) вместо суммы
+    is_already_admin, chat = await asyncio.gather(
+        Database.is_admin_in_db(new_admin_id),
+        message.bot.get_chat(new_admin_id),
+        return_exceptions=True,
+    )
+    if isinstance(is_already_admin, BaseException):
+        raise is_already_admin
     if is_already_admin:
         await state.clear()
         await message.answer("⚠️ Этот пользователь уже админ", reply_markup=ADMIN_MENU)
         return
 
     # Получаем username с fallback
-    username = None
-    try:
-        chat = await message.bot.get_chat(new_admin_id)
+    if not isinstance(chat, BaseException):
         username = chat.username
         logging.info(f"Successfully got username for {new_admin_id}: {username}")
-    except Exception as e:
-        logging.warning(f"Failed to get username for {new_admin_id}: {e}")
+    else:
+        logging.warning(f"Failed to get username for {new_admin_id}: {chat}")
 
         # Просим ввести username вручную
         await state.update_data(pending_admin_id=new_admin_id)
@@ -202,7 +226,7 @@ async def add_admin_process(message: Message, state: FSMContext):
 @router.message(AdminStates.awaiting_admin_username)
 async def add_admin_username(message: Message, state: FSMContext):
     """Обработка ручного ввода username"""
-    if not is_admin(message.from_user.id):
+    if not await is_admin(message.from_user.id):
         await state.clear()
         return
 
@@ -302,17 +326,20 @@ async def _finalize_admin_addition(
 @router.callback_query(F.data == "change_role_start")
 async def change_role_start(callback: CallbackQuery):
     """Начало изменения роли"""
-    if not is_admin(callback.from_user.id):
+    allowed, permitted, db_admins = await asyncio.gather(
+        is_admin(callback.from_user.id),
+        has_permission(callback.from_user.id, "manage_admins"),
+        Database.get_all_admins(),
+    )
+    if not allowed:
         await callback.answer("❌ Нет доступа", show_alert=True)
         return
 
     # Проверка разрешения
-    if not await has_permission(callback.from_user.id, "manage_admins"):
+    if not permitted:
         await callback.answer("❌ Недостаточно прав\n\nТолько для Super Admin", show_alert=True)
         return
 
-    db_admins = await Database.get_all_admins()
-
     if not db_admins:
         await callback.answer(
             "ℹ️ Нет динамических админов\n\nТолько статические (.env) админы",
@@ -320,21 +347,27 @@ async def change_role_start(callback: CallbackQuery):
         )
         return
 
-    keyboard = []
-    for user_id, username, added_by, added_at, role in db_admins:
-        display_text = f"{user_id}"
-        if username:
-            display_text += f" (@{username})"
-
-        # Текущая роль
-        role_badge = await get_admin_role_display(user_id)
-        display_text = f"{role_badge} {display_text}"
+    await _render_change_role_menu(callback, db_admins)
+    await callback.answer()
 
-        keyboard.append(
-            [InlineKeyboardButton(text=display_text, callback_data=f"select_admin_role:{user_id}")]
-        )
 
-    keyboard.append([InlineKeyboardButton(text="🔙 Назад", callback_data="back_to_admin_menu")])
+async def _render_change_role_menu(callback: CallbackQuery, db_admins: list) -> None:
+    """Показать список админов для смены роли (callback не отвечает)"""
+    # Текущая роль - из строки get_all_admins
+    keyboard = [
+        [
+            InlineKeyboardButton(
+                text=(
+                    f"{format_role_badge(role)} {user_id} (@{username})"
+                    if username
+                    else f"{format_role_badge(role)} {user_id}"
+                ),
+                callback_data=f"select_admin_role:{user_id}",
+            )
+        ]
+        for user_id, username, added_by, added_at, role in db_admins
+    ]
+    keyboard.append([_BACK_TO_ADMIN_MENU_BUTTON])
 
     kb = InlineKeyboardMarkup(inline_keyboard=keyboard)
 
@@ -344,13 +377,12 @@ async def change_role_start(callback: CallbackQuery):
         "Выберите администратора:",
         reply_markup=kb,
     )
-    await callback.answer()
 
 
 @router.callback_query(F.data.startswith("select_admin_role:"))
 async def select_admin_role(callback: CallbackQuery):
     """Выбор новой роли для админа"""
-    if not is_admin(callback.from_user.id):
+    if not await is_admin(callback.from_user.id):
         await callback.answer("❌ Нет доступа", show_alert=True)
         return
 
@@ -359,8 +391,8 @@ async def select_admin_role(callback: CallbackQuery):
         return
 
     try:
-        target_admin_id = int(callback.data.split(":")[1])
-    except (IndexError, ValueError):
+        target_admin_id = int(split_callback_data(callback.data)[0])
+    except ValueError:
         await callback.answer("❌ Ошибка данных", show_alert=True)
         return
 
@@ -404,7 +436,7 @@ async def select_admin_role(callback: CallbackQuery):
 @router.callback_query(F.data.startswith("confirm_role:"))
 async def confirm_role_change(callback: CallbackQuery):
     """Подтверждение изменения роли"""
-    if not is_admin(callback.from_user.id):
+    if not await is_admin(callback.from_user.id):
         await callback.answer("❌ Нет доступа", show_alert=True)
         return
 
@@ -413,10 +445,9 @@ async def confirm_role_change(callback: CallbackQuery):
         return
 
     try:
-        parts = callback.data.split(":")
-        target_admin_id = int(parts[1])
-        new_role = parts[2]
-    except (IndexError, ValueError):
+        target_id_str, new_role = split_callback_data(callback.data)
+        target_admin_id = int(target_id_str)
+    except ValueError:
         await callback.answer("❌ Ошибка данных", show_alert=True)
         return
 
@@ -468,8 +499,8 @@ async def confirm_role_change(callback: CallbackQuery):
         except Exception as e:
             logging.warning(f"Failed to notify admin {target_admin_id}: {e}")
 
-        # Возвращаемся к списку
-        await change_role_start(callback)
+        # Возвращаемся к списку (callback уже отвечен выше)
+        await _render_change_role_menu(callback, await Database.get_all_admins())
     else:
         await callback.answer("❌ Ошибка изменения роли", show_alert=True)
 
@@ -477,32 +508,40 @@ async def confirm_role_change(callback: CallbackQuery):
 @router.callback_query(F.data == "remove_admin_start")
 async def remove_admin_menu(callback: CallbackQuery):
     """Меню удаления админа"""
-    if not is_admin(callback.from_user.id):
+    allowed, permitted, db_admins = await asyncio.gather(
+        is_admin(callback.from_user.id),
+        has_permission(callback.from_user.id, "manage_admins"),
+        Database.get_all_admins(),
+    )
+    if not allowed:
         await callback.answer("❌ Нет доступа", show_alert=True)
         return
 
     # ✅ Проверка разрешения
-    if not await has_permission(callback.from_user.id, "manage_admins"):
+    if not permitted:
         await callback.answer("❌ Недостаточно прав\n\nТолько для Super Admin", show_alert=True)
         return
 
-    db_admins = await Database.get_all_admins()
-
     if not db_admins:
         await callback.answer("ℹ️ Нет динамических админов для удаления", show_alert=True)
         return
 
-    keyboard = []
-    for user_id, username, added_by, added_at, role in db_admins:
-        display_text = f"➖ {user_id}"
-        if username:
-            display_text += f" (@{username})"
+    await _render_remove_admin_menu(callback, db_admins)
+    await callback.answer()
 
-        keyboard.append(
-            [InlineKeyboardButton(text=display_text, callback_data=f"remove_admin:{user_id}")]
-        )
 
-    keyboard.append([InlineKeyboardButton(text="🔙 Назад", callback_data="back_to_admin_menu")])
+async def _render_remove_admin_menu(callback: CallbackQuery, db_admins: list) -> None:
+    """Показать меню удаления для уже загруженного списка админов из БД"""
+    keyboard = [
+        [
+            InlineKeyboardButton(
+                text=f"➖ {user_id} (@{username})" if username else f"➖ {user_id}",
+                callback_data=f"remove_admin:{user_id}",
+            )
+        ]
+        for user_id, username, added_by, added_at, role in db_admins
+    ]
+    keyboard.append([_BACK_TO_ADMIN_MENU_BUTTON])
 
     kb = InlineKeyboardMarkup(inline_keyboard=keyboard)
 
@@ -513,13 +552,12 @@ async def remove_admin_menu(callback: CallbackQuery):
         "Выберите админа для удаления:",
         reply_markup=kb,
     )
-    await callback.answer()
 
 
 @router.callback_query(F.data.startswith("remove_admin:"))
 async def remove_admin_confirm(callback: CallbackQuery):
     """Подтверждение удаления админа"""
-    if not is_admin(callback.from_user.id):
+    if not await is_admin(callback.from_user.id):
         await callback.answer("❌ Нет доступа", show_alert=True)
         return
 
@@ -528,8 +566,8 @@ async def remove_admin_confirm(callback: CallbackQuery):
         return
 
     try:
-        admin_to_remove = int(callback.data.split(":")[1])
-    except (IndexError, ValueError):
+        admin_to_remove = int(split_callback_data(callback.data)[0])
+    except ValueError:
         await callback.answer("❌ Ошибка данных", show_alert=True)
         return
 
@@ -538,8 +576,10 @@ async def remove_admin_confirm(callback: CallbackQuery):
         await callback.answer("❌ Нельзя удалить себя", show_alert=True)
         return
 
-    # Проверка последнего админа
-    total_admins = len(ADMIN_IDS) + await Database.get_admin_count()
+    # Проверка последнего админа. Список (а не только счетчик) нужен,
+    # чтобы после удаления перерисовать меню без повторных запросов
+    db_admins = await Database.get_all_admins()
+    total_admins = len(ADMIN_IDS) + len(db_admins)
     if total_admins <= 1:
         await callback.answer("❌ Нельзя удалить последнего админа", show_alert=True)
         return
@@ -569,8 +609,11 @@ async def remove_admin_confirm(callback: CallbackQuery):
 
         logging.info(f"Admin {callback.from_user.id} removed admin {admin_to_remove}")
 
-        # Обновляем меню
-        await remove_admin_menu(callback)
+        # Обновляем меню: удаленный админ убирается из уже загруженного
+        # списка (callback уже отвечен выше - повторный answer не нужен)
+        await _render_remove_admin_menu(
+            callback, [admin for admin in db_admins if admin[0] != admin_to_remove]
+        )
     else:
         await callback.answer("❌ Ошибка удаления", show_alert=True)
 
@@ -581,24 +624,6 @@ async def back_to_admin_menu(callback: CallbackQuery):
     await callback.message.delete()
 
     # Пересоздаём меню
-    kb = InlineKeyboardMarkup(
-        inline_keyboard=[
-            [InlineKeyboardButton(text="📋 Список админов", callback_data="list_admins")],
-            [InlineKeyboardButton(text="➕ Добавить админа", callback_data="add_admin_start")],
-            [InlineKeyboardButton(text="➖ Удалить админа", callback_data="remove_admin_start")],
-            [InlineKeyboardButton(text="🔄 Изменить роль", callback_data="change_role_start")],
-        ]
-    )
-
     admin_count = await Database.get_admin_count()
-    total_admins = len(ADMIN_IDS) + admin_count
-
-    await callback.message.answer(
-        f"👥 УПРАВЛЕНИЕ АДМИНИСТРАТОРАМИ\n\n"
-        f"🔑 Статические (.env): {len(ADMIN_IDS)}\n"
-        f"💾 Динамические (БД): {admin_count}\n"
-        f"👥 Всего: {total_admins}\n\n"
-        "Выберите действие:",
-        reply_markup=kb,
-    )
+    await callback.message.answer(_admin_menu_text(admin_count), reply_markup=_ADMIN_MENU_KB)
     await callback.answer()
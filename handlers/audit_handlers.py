@@ -2,9 +2,16 @@
 
 import logging
 from datetime import datetime
+from pathlib import Path
 
 from aiogram import F, Router
-from aiogram.types import CallbackQuery, InlineKeyboardButton, InlineKeyboardMarkup, Message
+from aiogram.types import (
+    CallbackQuery,
+    FSInputFile,
+    InlineKeyboardButton,
+    InlineKeyboardMarkup,
+    Message,
+)
 
 from database.repositories.audit_repository import AuditRepository
 from utils.helpers import is_admin
@@ -121,16 +128,12 @@ async def audit_export_callback(callback: CallbackQuery):
 
     await callback.answer("⏳ Генерирую CSV...")
 
-    from pathlib import Path
-
     filepath = Path("exports") / f"audit_log_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
     filepath.parent.mkdir(exist_ok=True)
 
     success = await AuditRepository.export_to_csv(str(filepath))
 
     if success:
-        from aiogram.types import FSInputFile
-
         await callback.message.answer_document(FSInputFile(filepath), caption="💾 Audit Log Export")
         filepath.unlink()  # Удаляем после отправки
     else:
@@ -43,6 +43,14 @@ from utils.validators import (
 
 router = Router()
 
+# Тексты ошибок создания записи по коду из BookingService
+_BOOKING_ERROR_MESSAGES = {
+    ERROR_NO_SERVICES: "⚠️ Услуги временно недоступны\n\nОбратитесь к администратору",
+    ERROR_SERVICE_UNAVAILABLE: "⚠️ Выбранная услуга недоступна",
+    ERROR_LIMIT_EXCEEDED: f"⚠️ У вас уже {MAX_BOOKINGS_PER_USER} активных записи",
+    ERROR_SLOT_TAKEN: "❌ Этот слот уже занят!",
+}
+
 
 @router.message(F.text == "📅 Записаться")
 async def booking_start(message: Message, state: FSMContext):
@@ -371,14 +379,7 @@ async def book_time(
             logging.error(f"Failed to notify admin: {e}")
     else:
         # УЛУЧШЕННАЯ обработка ошибок с константами
-        error_messages = {
-            ERROR_NO_SERVICES: "⚠️ Услуги временно недоступны\n\nОбратитесь к администратору",
-            ERROR_SERVICE_UNAVAILABLE: "⚠️ Выбранная услуга недоступна",
-            ERROR_LIMIT_EXCEEDED: f"⚠️ У вас уже {MAX_BOOKINGS_PER_USER} активных записи",
-            ERROR_SLOT_TAKEN: "❌ Этот слот уже занят!",
-        }
-
-        message = error_messages.get(error_code, "❌ Произошла ошибка, попробуйте позже")
+        message = _BOOKING_ERROR_MESSAGES.get(error_code, "❌ Произошла ошибка, попробуйте позже")
 
         if error_code == ERROR_NO_SERVICES:
             # Критичная ошибка - услуги отсутствуют
@@ -9,6 +9,7 @@ from aiogram.fsm.context import FSMContext
 from aiogram.types import CallbackQuery, InlineKeyboardButton, InlineKeyboardMarkup, Message
 from aiogram_calendar import SimpleCalendar, SimpleCalendarCallback
 
+from config import WORK_HOURS_END, WORK_HOURS_START
 from database.repositories.audit_repository import AuditRepository
 from database.repositories.booking_repository import BookingRepository
 from database.repositories.calendar_repository import CalendarRepository
@@ -68,8 +69,6 @@ async def process_reschedule_date(
         blocked = await BookingRepository.get_blocked_slots(date_str)
 
         # Генерируем слоты (пока простая логика 9-19)
-        from config import WORK_HOURS_END, WORK_HOURS_START
-
         occupied_times = {slot[0] for slot in occupied}
         blocked_times = {slot[1] for slot in blocked}
 
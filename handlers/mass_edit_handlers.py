@@ -178,8 +178,18 @@ async def mass_edit_time_shift(message: Message, state: FSMContext):
     data = await state.get_data()
     date_str = data.get("edit_date")
 
-    # Получаем все записи
-    bookings = await Database.get_week_schedule(date_str, days=1)
+    # Получаем все записи и занятые времена дня (один запрос на день)
+    try:
+        bookings = await Database.get_week_schedule(date_str, days=1)
+        taken_times = await Database.get_taken_times_for_day(date_str)
+    except Exception as e:
+        # Без занятых времен проверять нечего: сообщаем и выходим из FSM
+        logging.error(f"Mass edit time: error loading slots for {date_str}: {e}")
+        await state.clear()
+        await message.answer(
+            "❌ Ошибка загрузки расписания. Попробуйте позже.", reply_markup=ADMIN_MENU
+        )
+        return
 
     success_count = 0
     fail_count = 0
@@ -201,8 +211,7 @@ async def mass_edit_time_shift(message: Message, state: FSMContext):
                 continue
 
             # Проверка что новое время свободно
-            is_free = await Database.is_slot_free(date_str, new_time)
-            if not is_free and new_time != old_time:
+            if new_time in taken_times and new_time != old_time:
                 errors.append(f"{old_time} → {new_time} (занято)")
                 fail_count += 1
                 continue
@@ -18,6 +18,14 @@ router = Router()
 # ✅ NEW: Доступные интервалы слотов
 SLOT_INTERVALS = [30, 60, 90, 120]
 
+# Названия полей услуги для текстового ввода
+_FIELD_NAMES = {
+    "name": "название",
+    "description": "описание",
+    "duration": "длительность (в минутах)",
+    "price": "цена",
+}
+
 
 # === ГЛАВНОЕ МЕНЮ УПРАВЛЕНИЯ УСЛУГАМИ ===
 
@@ -421,19 +429,12 @@ async def service_edit_field_start(callback: CallbackQuery, state: FSMContext):
         return
 
     # Остальные поля - текстовый ввод
-    field_names = {
-        "name": "название",
-        "description": "описание",
-        "duration": "длительность (в минутах)",
-        "price": "цена",
-    }
-
     await state.set_state(AdminStates.service_edit_value)
     await state.update_data(service_id=service_id, field=field)
 
     await callback.message.edit_text(
         f"✏️ РЕДАКТИРОВАНИЕ\n\n"
-        f"Введите новое значение для поля '{field_names.get(field, field)}':\n\n"
+        f"Введите новое значение для поля '{_FIELD_NAMES.get(field, field)}':\n\n"
         "Для отмены отправьте /cancel"
     )
     await callback.answer()
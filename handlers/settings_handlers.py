@@ -24,8 +24,7 @@ async def settings_menu(message: Message):
         return
 
     # Получаем текущие настройки
-    start_hour, end_hour = await SettingsRepository.get_work_hours()
-    slot_interval = await SettingsRepository.get_slot_interval()  # ✅ НОВОЕ!
+    start_hour, end_hour, slot_interval = await SettingsRepository.get_schedule_config()
 
     kb = InlineKeyboardMarkup(
         inline_keyboard=[
@@ -373,8 +372,7 @@ async def settings_back(callback: CallbackQuery):
     """Возврат в главное меню настроек"""
     await callback.message.delete()
 
-    start_hour, end_hour = await SettingsRepository.get_work_hours()
-    slot_interval = await SettingsRepository.get_slot_interval()  # ✅ НОВОЕ!
+    start_hour, end_hour, slot_interval = await SettingsRepository.get_schedule_config()
 
     kb = InlineKeyboardMarkup(
         inline_keyboard=[
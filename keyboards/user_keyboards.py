@@ -192,13 +192,15 @@ async def create_time_slots(
     
     # ✅ КРИТИЧНО: Интервал слотов - ГЛОБАЛЬНАЯ настройка из БД!
     # НЕ из услуги! Это сетка времени для всех услуг.
-    slot_interval = await SettingsRepository.get_slot_interval()
-
-    # ✅ КРИТИЧНО: Получаем ДИНАМИЧЕСКИЕ рабочие часы из БД!
-    start_hour, end_hour = await SettingsRepository.get_work_hours()
+    # Вместе с ДИНАМИЧЕСКИМИ рабочими часами - одним обращением.
+    start_hour, end_hour, slot_interval = await SettingsRepository.get_schedule_config()
 
     # ✅ КРИТИЧНО: Получаем занятые слоты С ДЛИТЕЛЬНОСТЬЮ
-    occupied_slots = await Database.get_occupied_slots_for_day(date_str)
+    # (минуты от начала суток: начало и длительность, без парсинга строк в цикле)
+    occupied_starts, occupied_durations = await Database.get_occupied_intervals_for_day(date_str)
+    occupied_intervals = [
+        (start, start + duration) for start, duration in zip(occupied_starts, occupied_durations)
+    ]
 
     free_count = 0
     
@@ -240,21 +242,12 @@ async def create_time_slots(
             continue
 
         # ✅ КРИТИЧНО: Проверяем пересечения с РЕАЛЬНОЙ длительностью
-        is_free = True
-        for occupied_time, occupied_duration in occupied_slots:
-            occupied_datetime_naive = datetime.combine(
-                date_obj.date(), datetime.strptime(occupied_time, "%H:%M").time()
-            )
-            occupied_datetime = TIMEZONE.localize(occupied_datetime_naive)
-
-            # ✅ КРИТИЧНО: Используем РЕАЛЬНУЮ duration из БД!
-            occupied_end = occupied_datetime + timedelta(minutes=occupied_duration)
-
-            # Проверяем пересечение интервалов
-            # [slot_start, slot_end) пересекается с [occupied_start, occupied_end)
-            if slot_datetime < occupied_end and end_datetime > occupied_datetime:
-                is_free = False
-                break
+        # [slot_start, slot_end) пересекается с [occupied_start, occupied_end)
+        slot_end_minutes = current_minutes + duration_minutes
+        is_free = not any(
+            current_minutes < occupied_end and slot_end_minutes > occupied_start
+            for occupied_start, occupied_end in occupied_intervals
+        )
 
         if is_free:
             free_count += 1
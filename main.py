@@ -41,6 +41,7 @@ from database.migrations.versions.v007_fix_booking_history_constraints import Fi
 from database.migrations.versions.v008_add_slot_interval import AddSlotInterval
 from database.migrations.versions.v009_text_templates import V009TextTemplates
 from database.queries import Database
+from database.repositories._conn import close_conn, optimize_conn
 from handlers import (
     admin_handlers,
     admin_management_handlers,
@@ -407,6 +408,16 @@ async def start_bot():
     # ✅ P0 FIX: Настройка напоминаний с исправленными event loop wrappers + 2h reminder
     setup_reminder_jobs(scheduler, bot)
 
+    # PRAGMA optimize для общего SQLite-соединения - каждые 15 минут
+    scheduler.add_job(
+        optimize_conn,
+        "interval",
+        minutes=15,
+        id="sqlite_optimize",
+        replace_existing=True,
+        max_instances=1,
+    )
+
     # Middlewares (порядок важен!)
     dp.callback_query.middleware(MessageCleanupMiddleware(ttl_hours=48))
     
@@ -498,6 +509,9 @@ async def start_bot():
         # ✅ NEW: Закрытие PostgreSQL pool
         await db_adapter.close_pool()
         logger.info("Database pool closed")
+
+        # Общее SQLite-соединение legacy-репозиториев (если открывалось)
+        await close_conn()
         
         await bot.session.close()
         scheduler.shutdown(wait=False)
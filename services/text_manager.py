@@ -6,9 +6,12 @@
 3. Hardcoded fallback - на случай ошибок
 """
 
+import asyncio
+import heapq
 import logging
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, Optional, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 
 import aiosqlite
 import yaml
@@ -17,12 +20,18 @@ from cachetools import TTLCache
 from config import DATABASE_PATH
 from utils.helpers import now_local
 
+# C-парсер libyaml, если PyYAML собран с ним (в разы быстрее чистого Python)
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 class HybridTextManager:
     """Гибридный менеджер текстов с поддержкой БД и YAML"""
 
     # Кэш на 5 минут (TTL)
     _cache: TTLCache = TTLCache(maxsize=1000, ttl=300)
+    # Результаты get_all() по категории: одно слияние БД+YAML на все
+    # callbacks админки, сбрасывается при любом изменении текстов
+    _all_cache: TTLCache = TTLCache(maxsize=64, ttl=300)
 
     # YAML тексты (загружаются один раз при старте)
     _yaml_texts: Dict[str, Dict] = {}
@@ -60,8 +69,9 @@ class HybridTextManager:
                 logging.warning(f"YAML file not found: {yaml_path}")
                 return
 
-            with open(yaml_path, "r", encoding="utf-8") as f:
-                cls._yaml_texts[lang] = yaml.safe_load(f) or {}
+            # Чтение и разбор - в потоке, event loop не блокируется;
+            # словарь подменяется целиком, без окна с пустыми текстами
+            cls._yaml_texts[lang] = await asyncio.to_thread(cls._read_yaml, yaml_path)
 
             logging.info(f"✅ Loaded {len(cls._yaml_texts[lang])} YAML categories for '{lang}'")
             cls._yaml_loaded = True
@@ -69,6 +79,12 @@ class HybridTextManager:
         except Exception as e:
             logging.error(f"Error loading YAML texts: {e}", exc_info=True)
 
+    @staticmethod
+    def _read_yaml(yaml_path: Path) -> Dict:
+        """Прочитать и разобрать YAML (синхронно, вызывается через to_thread)"""
+        with open(yaml_path, "r", encoding="utf-8") as f:
+            return yaml.load(f, Loader=_YAML_LOADER) or {}
+
     @classmethod
     def _get_from_yaml(cls, key: str, lang: str = "ru") -> Optional[str]:
         """Получить текст из YAML
@@ -221,6 +237,7 @@ class HybridTextManager:
             # Сбрасываем кэш
             cache_key = f"{key}:{lang}"
             cls._cache.pop(cache_key, None)
+            cls._all_cache.clear()
 
             logging.info(f"✅ Text updated: {key} by admin {admin_id}")
             return True
@@ -248,6 +265,7 @@ class HybridTextManager:
             # Сбрасываем кэш
             cache_key = f"{key}:{lang}"
             cls._cache.pop(cache_key, None)
+            cls._all_cache.clear()
 
             logging.info(f"✅ Text reset to default: {key}")
             return True
@@ -264,52 +282,121 @@ class HybridTextManager:
             category: Категория (необязательно)
 
         Returns:
-            Dict[key, (text, is_custom)]
+            Dict[key, (text, is_custom)] в порядке ключей
         """
-        result = {}
+        cached = cls._all_cache.get(category)
+        if cached is not None:
+            return dict(cached)
 
         try:
-            # Загружаем из БД
+            # Загружаем из БД (уже отсортировано по key - порядок индекса)
             async with aiosqlite.connect(DATABASE_PATH) as db:
                 if category:
-                    query = "SELECT key, text_ru, is_custom FROM text_templates WHERE category = ?"
-                    params = (category,)
+                    # Категория - префикс ключа "category.": диапазон по
+                    # уникальному индексу key, одним запросом. Колонка
+                    # category не подходит - update() ее не заполняет, и
+                    # кастомизированные тексты попадали бы в 'general'
+                    query = (
+                        "SELECT key, text_ru, is_custom FROM text_templates "
+                        "WHERE key >= ? AND key < ? ORDER BY key"
+                    )
+                    params = cls._key_prefix_range(category)
                 else:
-                    query = "SELECT key, text_ru, is_custom FROM text_templates"
+                    query = "SELECT key, text_ru, is_custom FROM text_templates ORDER BY key"
                     params = ()
 
                 async with db.execute(query, params) as cursor:
                     rows = await cursor.fetchall()
-                    for key, text, is_custom in rows:
-                        result[key] = (text, bool(is_custom))
+                    db_items = [(key, (text, bool(is_custom))) for key, text, is_custom in rows]
 
             # Добавляем из YAML (только если нет в БД)
-            if cls._yaml_loaded and category:
-                yaml_category = cls._yaml_texts.get("ru", {}).get(category, {})
-                if isinstance(yaml_category, dict):
-                    for subkey, value in yaml_category.items():
-                        if isinstance(value, str):
-                            full_key = f"{category}.{subkey}"
-                            if full_key not in result:
-                                result[full_key] = (value, False)
-
-            return result
+            yaml_items = []
+            if category:
+                db_keys = {key for key, _ in db_items}
+                yaml_items = [
+                    (key, (value, False))
+                    for key, value in cls._yaml_category_items(category, db_keys)
+                ]
+
+            # Слияние двух отсортированных последовательностей - результат
+            # уже в порядке ключей, вызывающему коду не нужен sorted()
+            result = dict(heapq.merge(db_items, yaml_items, key=itemgetter(0)))
+            cls._all_cache[category] = result
+            return dict(result)
 
         except Exception as e:
             logging.error(f"Error getting all texts: {e}", exc_info=True)
             return {}
 
+    @classmethod
+    async def get_category_keys(cls, category: str) -> List[Tuple[str, bool]]:
+        """Ключи категории со статусом кастомизации - для списка в админке
+
+        То же, что get_all(category), но без тел текстов: из БД читаются
+        только key и is_custom.
+
+        Args:
+            category: Категория
+
+        Returns:
+            [(key, is_custom)] в порядке ключей
+        """
+        try:
+            async with aiosqlite.connect(DATABASE_PATH) as db:
+                async with db.execute(
+                    "SELECT key, is_custom FROM text_templates "
+                    "WHERE key >= ? AND key < ? ORDER BY key",
+                    cls._key_prefix_range(category),
+                ) as cursor:
+                    db_items = [
+                        (key, bool(is_custom)) for key, is_custom in await cursor.fetchall()
+                    ]
+
+            db_keys = {key for key, _ in db_items}
+            yaml_items = [(key, False) for key, _ in cls._yaml_category_items(category, db_keys)]
+            return list(heapq.merge(db_items, yaml_items, key=itemgetter(0)))
+
+        except Exception as e:
+            logging.error(f"Error getting category keys '{category}': {e}", exc_info=True)
+            return []
+
+    @classmethod
+    def _yaml_category_items(cls, category: str, exclude: Set[str]) -> List[Tuple[str, str]]:
+        """Тексты категории из YAML, кроме ключей exclude: [(key, text)] по ключу"""
+        if not cls._yaml_loaded:
+            return []
+        yaml_category = cls._yaml_texts.get("ru", {}).get(category, {})
+        if not isinstance(yaml_category, dict):
+            return []
+        return sorted(
+            (f"{category}.{subkey}", value)
+            for subkey, value in yaml_category.items()
+            if isinstance(value, str) and f"{category}.{subkey}" not in exclude
+        )
+
+    @staticmethod
+    def _key_prefix_range(category: str) -> Tuple[str, str]:
+        """Границы [low, high) ключей категории: "cat." <= key < "cat/"
+
+        "/" идет в ASCII сразу за ".", поэтому диапазон содержит ровно
+        ключи с префиксом "cat." и обслуживается индексом по key
+        (в отличие от LIKE, который в SQLite регистронезависим).
+        """
+        return f"{category}.", f"{category}/"
+
     @classmethod
     def clear_cache(cls):
         """Очистить весь кэш (при массовых изменениях)"""
         cls._cache.clear()
+        cls._all_cache.clear()
         logging.info("🧹 Text cache cleared")
 
     @classmethod
     async def reload_yaml(cls):
-        """Перезагрузить YAML тексты (после редактирования)"""
-        cls._yaml_loaded = False
-        cls._yaml_texts.clear()
+        """Перезагрузить YAML тексты (после редактирования)
+
+        Если файл не прочитался, остаются ранее загруженные тексты.
+        """
         await cls._load_yaml_texts()
         cls.clear_cache()
         logging.info("🔄 YAML texts reloaded")
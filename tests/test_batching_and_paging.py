@@ -0,0 +1,163 @@
+"""Тесты пакетных операций и постраничного чтения"""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from database.repositories.calendar_repository import CalendarRepository
+from database.repositories.user_repository import UserRepository
+from database.schema_manager import SchemaManager
+from utils.helpers import split_callback_data
+
+
+class TestIterAllUsers:
+    """Keyset-пагинация iter_all_users"""
+
+    @pytest.mark.asyncio
+    async def test_pages_continue_after_last_id(self):
+        """Следующая страница начинается после последнего id предыдущей"""
+        with patch("database.repositories.user_repository.db_adapter") as mock_db:
+            mock_db.fetchcol = AsyncMock(side_effect=[[1, 2], [5, 7], [9]])
+
+            user_ids = [user_id async for user_id in UserRepository.iter_all_users(page_size=2)]
+
+            assert user_ids == [1, 2, 5, 7, 9]
+            assert [c.args[1:] for c in mock_db.fetchcol.await_args_list] == [
+                (-1, 2),
+                (2, 2),
+                (7, 2),
+            ]
+
+    @pytest.mark.asyncio
+    async def test_full_last_page_ends_on_empty_page(self):
+        """Если последняя страница полная - еще один запрос возвращает пусто"""
+        with patch("database.repositories.user_repository.db_adapter") as mock_db:
+            mock_db.fetchcol = AsyncMock(side_effect=[[1, 2], []])
+
+            user_ids = [user_id async for user_id in UserRepository.iter_all_users(page_size=2)]
+
+            assert user_ids == [1, 2]
+            assert mock_db.fetchcol.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_db_error_is_propagated(self):
+        """Ошибка БД не превращается в молчаливый конец рассылки"""
+        with patch("database.repositories.user_repository.db_adapter") as mock_db:
+            mock_db.fetchcol = AsyncMock(side_effect=[[1, 2], RuntimeError("db down")])
+
+            received = []
+            with pytest.raises(RuntimeError):
+                async for user_id in UserRepository.iter_all_users(page_size=2):
+                    received.append(user_id)
+
+            assert received == [1, 2]
+
+
+class TestSchemaBulkInit:
+    """SchemaManager.bulk_init: группы schemas на отдельных соединениях"""
+
+    @pytest.fixture(autouse=True)
+    def schema_cache(self, monkeypatch):
+        monkeypatch.setattr(SchemaManager, "_schema_cache", set())
+
+    @pytest.mark.asyncio
+    async def test_every_schema_in_exactly_one_batch(self):
+        """Каждая schema попадает ровно в одну группу, кэш обновляется"""
+        names = [f"client_{i}" for i in range(5)]
+        with patch.object(SchemaManager, "_execute_ddl_batch", AsyncMock()) as batch:
+            await SchemaManager.bulk_init(names, concurrency=2)
+
+        assert batch.await_count == 2
+        batched = [name for c in batch.await_args_list for name in c.args[0]]
+        assert sorted(batched) == sorted(names)
+        for c in batch.await_args_list:
+            for name in c.args[0]:
+                assert f"{name}.bookings" in c.args[1]
+        assert SchemaManager._schema_cache == set(names)
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_is_reported_and_not_cached(self):
+        """Упавшая группа попадает в RuntimeError и не кэшируется"""
+
+        async def execute_batch(chunk, _sql):
+            if "bad" in chunk:
+                raise RuntimeError("ddl failed")
+
+        with patch.object(SchemaManager, "_execute_ddl_batch", side_effect=execute_batch):
+            with pytest.raises(RuntimeError, match="bad"):
+                await SchemaManager.bulk_init(["good", "bad"], concurrency=2)
+
+        assert SchemaManager._schema_cache == {"good"}
+
+    @pytest.mark.asyncio
+    async def test_empty_list_is_noop(self):
+        """Пустой список - ни одного запроса"""
+        with patch.object(SchemaManager, "_execute_ddl_batch", AsyncMock()) as batch:
+            await SchemaManager.bulk_init([])
+
+        batch.assert_not_awaited()
+
+
+class TestBlockDateRangesBulk:
+    """CalendarRepository.block_date_ranges_bulk: один INSERT на все диапазоны"""
+
+    _RANGES = [
+        ("2026-01-01", "2026-01-01", None, None, "Новый год"),
+        ("2026-01-07", "2026-01-08", "10:00", "14:00", None),
+    ]
+
+    @pytest.mark.asyncio
+    async def test_ranges_are_sent_as_columns(self):
+        """Диапазоны транспонируются в массивы столбцов, один запрос"""
+        CalendarRepository._block_envelope = ("stale", 0.0)
+        with patch("database.repositories.calendar_repository.db_adapter") as mock_db:
+            mock_db.fetch = AsyncMock(return_value=[{"id": 10}, {"id": 11}])
+
+            block_ids = await CalendarRepository.block_date_ranges_bulk(self._RANGES, admin_id=1)
+
+            assert block_ids == [10, 11]
+            mock_db.fetch.assert_awaited_once()
+            assert mock_db.fetch.await_args.args[1:] == (
+                ["2026-01-01", "2026-01-07"],
+                ["2026-01-01", "2026-01-08"],
+                [None, "10:00"],
+                [None, "14:00"],
+                ["Новый год", None],
+                1,
+                False,
+            )
+        assert CalendarRepository._block_envelope is None
+
+    @pytest.mark.asyncio
+    async def test_empty_ranges_skip_query(self):
+        """Пустой список - без запроса"""
+        with patch("database.repositories.calendar_repository.db_adapter") as mock_db:
+            mock_db.fetch = AsyncMock()
+
+            assert await CalendarRepository.block_date_ranges_bulk([], admin_id=1) == []
+            mock_db.fetch.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_db_error_returns_empty_list(self):
+        """Ошибка БД - пустой список вместо исключения"""
+        with patch("database.repositories.calendar_repository.db_adapter") as mock_db:
+            mock_db.fetch = AsyncMock(side_effect=RuntimeError("db down"))
+
+            assert await CalendarRepository.block_date_ranges_bulk(self._RANGES, admin_id=1) == []
+
+
+class TestSplitCallbackData:
+    """split_callback_data: аргументы после action"""
+
+    @pytest.mark.parametrize(
+        "data, expected",
+        [
+            ("action:a:b", ("a", "b")),
+            ("action:a", ("a", "")),
+            ("action", ("", "")),
+            ("action:a:b:c", ("a", "b:c")),
+            ("action::b", ("", "b")),
+        ],
+    )
+    def test_split(self, data, expected):
+        assert split_callback_data(data) == expected
@@ -0,0 +1,149 @@
+"""Тесты SQLite-ветки db_adapter: общее соединение и единственный писатель"""
+
+import asyncio
+
+import aiosqlite
+import pytest
+
+from database import db_adapter as db_adapter_module
+from database.repositories import _conn
+
+
+@pytest.fixture
+async def adapter(tmp_path, monkeypatch):
+    """DatabaseAdapter в SQLite-режиме на временной БД"""
+    db_path = str(tmp_path / "test.db")
+    monkeypatch.setattr(_conn, "DATABASE_PATH", db_path)
+    monkeypatch.setattr(_conn, "_conn", None)
+    # Замки модуля привязываются к event loop - на каждый тест свои
+    monkeypatch.setattr(_conn, "_conn_lock", asyncio.Lock())
+    monkeypatch.setattr(_conn, "write_lock", asyncio.Lock())
+
+    adapter = db_adapter_module.DatabaseAdapter()
+    adapter.db_type = "sqlite"
+    adapter._initialized = True
+    await adapter.execute("CREATE TABLE t (id INTEGER PRIMARY KEY, v TEXT)")
+
+    yield adapter, db_path
+
+    await _conn.close_conn()
+
+
+async def _read_values(db_path):
+    """Значения, видимые отдельному соединению (т.е. зафиксированные)"""
+    async with aiosqlite.connect(db_path) as db:
+        async with db.execute("SELECT v FROM t ORDER BY id") as cursor:
+            return [row[0] for row in await cursor.fetchall()]
+
+
+class TestSQLiteWrites:
+    """Пишущие запросы фиксируются на любом пути выполнения"""
+
+    @pytest.mark.asyncio
+    async def test_insert_returning_via_fetchval_is_committed(self, adapter):
+        """INSERT ... RETURNING через fetchval коммитится сразу"""
+        db_adapter, db_path = adapter
+
+        new_id = await db_adapter.fetchval("INSERT INTO t (v) VALUES ($1) RETURNING id", "a")
+
+        assert new_id == 1
+        assert (await _conn.get_conn()).in_transaction is False
+        assert await _read_values(db_path) == ["a"]
+
+    @pytest.mark.asyncio
+    async def test_insert_returning_via_fetchrow_is_committed(self, adapter):
+        """INSERT ... RETURNING через fetchrow коммитится сразу"""
+        db_adapter, db_path = adapter
+
+        row = await db_adapter.fetchrow("INSERT INTO t (v) VALUES ($1) RETURNING id, v", "b")
+
+        assert row == {"id": 1, "v": "b"}
+        assert await _read_values(db_path) == ["b"]
+
+    @pytest.mark.asyncio
+    async def test_select_does_not_take_write_lock(self, adapter):
+        """Чтение не ждет write_lock (WAL)"""
+        db_adapter, _ = adapter
+
+        async with _conn.write_lock:
+            rows = await asyncio.wait_for(db_adapter.fetch("SELECT v FROM t"), timeout=1)
+
+        assert rows == []
+
+
+class TestSQLiteTransaction:
+    """transaction() держит write_lock до commit/rollback"""
+
+    @pytest.mark.asyncio
+    async def test_commit_only_on_exit(self, adapter):
+        """Запросы внутри транзакции не фиксируются по одному"""
+        db_adapter, db_path = adapter
+
+        async with db_adapter.acquire() as conn:
+            async with conn.transaction():
+                await conn.execute("INSERT INTO t (v) VALUES ($1)", "x")
+                await conn.fetchval("INSERT INTO t (v) VALUES ($1) RETURNING id", "y")
+                assert await _read_values(db_path) == []
+
+        assert await _read_values(db_path) == ["x", "y"]
+
+    @pytest.mark.asyncio
+    async def test_rollback_keeps_concurrent_write(self, adapter):
+        """Откат одной транзакции не теряет запись другой корутины"""
+        db_adapter, db_path = adapter
+        in_transaction = asyncio.Event()
+
+        async def failing_transaction():
+            async with db_adapter.acquire() as conn:
+                with pytest.raises(RuntimeError):
+                    async with conn.transaction():
+                        await conn.execute("INSERT INTO t (v) VALUES ($1)", "rolled_back")
+                        in_transaction.set()
+                        await asyncio.sleep(0.05)
+                        raise RuntimeError("boom")
+
+        async def concurrent_write():
+            await in_transaction.wait()
+            # Ждет write_lock, пока транзакция не откатится
+            await db_adapter.fetchrow("INSERT INTO t (v) VALUES ($1) RETURNING id", "kept")
+
+        await asyncio.gather(failing_transaction(), concurrent_write())
+
+        assert await _read_values(db_path) == ["kept"]
+
+    @pytest.mark.asyncio
+    async def test_write_waits_for_transaction(self, adapter):
+        """Запись вне транзакции выполняется только после ее commit"""
+        db_adapter, db_path = adapter
+        order = []
+        in_transaction = asyncio.Event()
+
+        async def transaction():
+            async with db_adapter.acquire() as conn:
+                async with conn.transaction():
+                    await conn.execute("INSERT INTO t (v) VALUES ($1)", "first")
+                    in_transaction.set()
+                    await asyncio.sleep(0.05)
+                    order.append("commit")
+
+        async def writer():
+            await in_transaction.wait()
+            await db_adapter.execute("INSERT INTO t (v) VALUES ($1)", "second")
+            order.append("write")
+
+        await asyncio.gather(transaction(), writer())
+
+        assert order == ["commit", "write"]
+        assert await _read_values(db_path) == ["first", "second"]
+
+    @pytest.mark.asyncio
+    async def test_nested_transaction_does_not_deadlock(self, adapter):
+        """Вложенный transaction() работает внутри внешнего"""
+        db_adapter, db_path = adapter
+
+        async with db_adapter.acquire() as conn:
+            async with conn.transaction():
+                async with conn.transaction():
+                    await conn.execute("INSERT INTO t (v) VALUES ($1)", "inner")
+
+        assert await _read_values(db_path) == ["inner"]
@@ -0,0 +1,245 @@
+"""Тесты in-process кэшей репозиториев: попадания, промахи и инвалидация"""
+
+import time
+from unittest.mock import AsyncMock, patch
+
+import aiosqlite
+import pytest
+
+from database.migrations.versions.v009_text_templates import V009TextTemplates
+from database.repositories.admin_repository import AdminRepository
+from database.repositories.settings_repository import SettingsRepository
+from services.text_manager import HybridTextManager
+
+
+@pytest.fixture(autouse=True)
+def reset_caches():
+    """Каждый тест начинает с пустых кэшей"""
+    AdminRepository._admin_ids_cache = None
+    SettingsRepository._settings_cache = None
+    SettingsRepository._schedule_config = None
+    HybridTextManager._cache.clear()
+    HybridTextManager._all_cache.clear()
+    yield
+    AdminRepository._admin_ids_cache = None
+    SettingsRepository._settings_cache = None
+    SettingsRepository._schedule_config = None
+    HybridTextManager._cache.clear()
+    HybridTextManager._all_cache.clear()
+
+
+class TestAdminIdsCache:
+    """Кэш id админов: только положительный is_admin"""
+
+    @pytest.mark.asyncio
+    async def test_hit_does_not_query_row(self):
+        """Админ из снимка - без запроса строки"""
+        with patch("database.repositories.admin_repository.db_adapter") as mock_db:
+            mock_db.fetchcol = AsyncMock(return_value=[1, 2])
+            mock_db.fetchval = AsyncMock()
+
+            assert await AdminRepository.is_admin(1) is True
+            assert await AdminRepository.is_admin(2) is True
+
+            mock_db.fetchcol.assert_awaited_once()
+            mock_db.fetchval.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_miss_checks_db_and_caches_found_admin(self):
+        """Промах - запрос одной строки, найденный админ попадает в кэш"""
+        with patch("database.repositories.admin_repository.db_adapter") as mock_db:
+            mock_db.fetchcol = AsyncMock(return_value=[1])
+            mock_db.fetchval = AsyncMock(return_value=True)
+
+            assert await AdminRepository.is_admin(5) is True
+            assert await AdminRepository.is_admin(5) is True
+
+            mock_db.fetchval.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_miss_for_non_admin_is_not_cached(self):
+        """Не-админ не кэшируется: добавление в другом процессе видно сразу"""
+        with patch("database.repositories.admin_repository.db_adapter") as mock_db:
+            mock_db.fetchcol = AsyncMock(return_value=[])
+            mock_db.fetchval = AsyncMock(side_effect=[False, True])
+
+            assert await AdminRepository.is_admin(7) is False
+            assert await AdminRepository.is_admin(7) is True
+
+    @pytest.mark.asyncio
+    async def test_remove_admin_updates_cache(self):
+        """remove_admin убирает id из снимка"""
+        with patch("database.repositories.admin_repository.db_adapter") as mock_db:
+            mock_db.fetchcol = AsyncMock(return_value=[1])
+            mock_db.execute = AsyncMock(return_value="DELETE 1")
+            mock_db.fetchval = AsyncMock(return_value=False)
+
+            assert await AdminRepository.is_admin(1) is True
+            assert await AdminRepository.remove_admin(1) is True
+            assert await AdminRepository.is_admin(1) is False
+
+    @pytest.mark.asyncio
+    async def test_add_admin_updates_cache(self):
+        """add_admin добавляет id в загруженный снимок"""
+        with patch("database.repositories.admin_repository.db_adapter") as mock_db:
+            mock_db.fetchcol = AsyncMock(return_value=[])
+            mock_db.execute = AsyncMock(return_value="INSERT 0 1")
+            mock_db.fetchval = AsyncMock(return_value=False)
+
+            assert await AdminRepository.is_admin(3) is False
+            assert await AdminRepository.add_admin(3, "user", 1) is True
+            assert await AdminRepository.is_admin(3) is True
+            mock_db.fetchval.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_expired_snapshot_is_reloaded(self):
+        """После TTL снимок перечитывается"""
+        with patch("database.repositories.admin_repository.db_adapter") as mock_db:
+            mock_db.fetchcol = AsyncMock(side_effect=[[1], [1, 2]])
+            mock_db.fetchval = AsyncMock(return_value=False)
+
+            await AdminRepository.is_admin(1)
+            AdminRepository._admin_ids_cache = (
+                AdminRepository._admin_ids_cache[0],
+                time.monotonic() - 1,
+            )
+
+            assert await AdminRepository.is_admin(2) is True
+            assert mock_db.fetchcol.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_role_is_always_read_from_db(self):
+        """get_admin_role не использует кэш - понижение видно сразу"""
+        with patch("database.repositories.admin_repository.db_adapter") as mock_db:
+            mock_db.fetchcol = AsyncMock(return_value=[1])
+            mock_db.fetchval = AsyncMock(side_effect=["super_admin", "moderator"])
+
+            assert await AdminRepository.is_admin(1) is True
+            assert await AdminRepository.get_admin_role(1) == "super_admin"
+            assert await AdminRepository.get_admin_role(1) == "moderator"
+
+
+class TestSettingsCache:
+    """Кэш настроек: один SELECT, свои записи применяются на месте"""
+
+    _ROWS = [
+        {"key": "work_hours_start", "value": "8"},
+        {"key": "work_hours_end", "value": "20"},
+        {"key": "slot_interval_minutes", "value": "30"},
+    ]
+
+    @pytest.mark.asyncio
+    async def test_getters_share_one_select(self):
+        """Все геттеры читают один загруженный снимок"""
+        with patch("database.repositories.settings_repository.db_adapter") as mock_db:
+            mock_db.fetch = AsyncMock(return_value=self._ROWS)
+
+            assert await SettingsRepository.get_work_hours() == (8, 20)
+            assert await SettingsRepository.get_slot_interval() == 30
+            assert await SettingsRepository.get_schedule_config() == (8, 20, 30)
+            assert await SettingsRepository.get_setting("work_hours_end") == "20"
+
+            mock_db.fetch.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_write_updates_cache_and_schedule_config(self):
+        """update_work_hours меняет кэш и разобранный config без перечитывания"""
+        with patch("database.repositories.settings_repository.db_adapter") as mock_db:
+            mock_db.fetch = AsyncMock(return_value=self._ROWS)
+            mock_db.execute = AsyncMock(return_value="INSERT 0 2")
+
+            assert await SettingsRepository.get_work_hours() == (8, 20)
+            assert await SettingsRepository.update_work_hours(7, 21) is True
+            assert await SettingsRepository.get_work_hours() == (7, 21)
+
+            mock_db.fetch.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_delete_removes_key_from_cache(self):
+        """delete_setting убирает ключ - геттер возвращает значение по умолчанию"""
+        with patch("database.repositories.settings_repository.db_adapter") as mock_db:
+            mock_db.fetch = AsyncMock(return_value=self._ROWS)
+            mock_db.execute = AsyncMock(return_value="DELETE 1")
+
+            assert await SettingsRepository.get_setting("slot_interval_minutes") == "30"
+            assert await SettingsRepository.delete_setting("slot_interval_minutes") is True
+            assert await SettingsRepository.get_setting("slot_interval_minutes") is None
+
+    @pytest.mark.asyncio
+    async def test_get_all_settings_returns_copy(self):
+        """Изменение результата get_all_settings не портит кэш"""
+        with patch("database.repositories.settings_repository.db_adapter") as mock_db:
+            mock_db.fetch = AsyncMock(return_value=self._ROWS)
+
+            settings = await SettingsRepository.get_all_settings()
+            settings["work_hours_start"] = "0"
+
+            assert await SettingsRepository.get_setting("work_hours_start") == "8"
+
+
+@pytest.fixture
+async def text_db(tmp_path, monkeypatch):
+    """Временная БД со схемой text_templates (миграция v009)"""
+    db_path = str(tmp_path / "texts.db")
+    monkeypatch.setattr("services.text_manager.DATABASE_PATH", db_path)
+    async with aiosqlite.connect(db_path) as db:
+        await db.execute("CREATE TABLE users (id INTEGER PRIMARY KEY)")
+        await V009TextTemplates().upgrade(db)
+        await db.commit()
+
+    monkeypatch.setattr(HybridTextManager, "_yaml_loaded", True)
+    monkeypatch.setattr(
+        HybridTextManager,
+        "_yaml_texts",
+        {"ru": {"zz": {"c": "yaml c", "a": "yaml a", "b": "yaml b"}}},
+    )
+    return db_path
+
+
+class TestTextManagerCategoryCache:
+    """Слияние БД+YAML по категории: кэш get_all и порядок ключей"""
+
+    @pytest.mark.asyncio
+    async def test_update_invalidates_category_cache(self, text_db):
+        """update() сбрасывает кэш - кастомизация видна в get_all"""
+        before = await HybridTextManager.get_all("zz")
+        assert before["zz.b"] == ("yaml b", False)
+
+        assert await HybridTextManager.update("zz.b", "custom b", admin_id=1) is True
+
+        after = await HybridTextManager.get_all("zz")
+        assert after["zz.b"] == ("custom b", True)
+
+    @pytest.mark.asyncio
+    async def test_reset_invalidates_category_cache(self, text_db):
+        """reset_to_default() возвращает YAML-значение в get_all"""
+        await HybridTextManager.update("zz.a", "custom a", admin_id=1)
+        assert (await HybridTextManager.get_all("zz"))["zz.a"] == ("custom a", True)
+
+        assert await HybridTextManager.reset_to_default("zz.a") is True
+
+        assert (await HybridTextManager.get_all("zz"))["zz.a"] == ("yaml a", False)
+
+    @pytest.mark.asyncio
+    async def test_get_all_returns_copy(self, text_db):
+        """Изменение результата get_all не портит кэш"""
+        texts = await HybridTextManager.get_all("zz")
+        texts.clear()
+
+        assert len(await HybridTextManager.get_all("zz")) == 3
+
+    @pytest.mark.asyncio
+    async def test_category_keys_merge_db_and_yaml_in_key_order(self, text_db):
+        """get_category_keys: БД и YAML слиты по ключу, соседняя категория не попадает"""
+        async with aiosqlite.connect(text_db) as db:
+            await db.executemany(
+                "INSERT INTO text_templates (key, text_ru, is_custom) VALUES (?, ?, ?)",
+                [("zz.b", "custom b", 1), ("zzz.x", "other", 1)],
+            )
+            await db.commit()
+
+        assert await HybridTextManager.get_category_keys("zz") == [
+            ("zz.a", False),
+            ("zz.b", True),
+            ("zz.c", False),
+        ]
@@ -1,6 +1,7 @@
 """Вспомогательные функции"""
 
 from datetime import datetime
+from typing import Tuple
 
 from config import DAY_NAMES, TIMEZONE
 
@@ -32,6 +33,23 @@ def create_ascii_chart(data: list, width: int = 7) -> str:
     return "".join(bars)
 
 
+def split_callback_data(data: str) -> Tuple[str, str]:
+    """
+    Аргументы callback_data вида "action:a" / "action:a:b".
+
+    Два partition вместо split(":") - без промежуточного списка.
+
+    Args:
+        data: callback_data
+
+    Returns:
+        (a, b); отсутствующие части - пустые строки
+    """
+    _, _, rest = data.partition(":")
+    first, _, second = rest.partition(":")
+    return first, second
+
+
 def is_static_admin(user_id: int) -> bool:
     """
     Проверка статических админов из .env
@@ -44,9 +62,9 @@ def is_static_admin(user_id: int) -> bool:
     Returns:
         True если админ в .env, False если нет
     """
-    from config import ADMIN_IDS
+    from config import ADMIN_IDS_SET
 
-    return user_id in ADMIN_IDS
+    return user_id in ADMIN_IDS_SET
 
 
 async def is_admin(user_id: int) -> bool:
@@ -63,11 +81,11 @@ async def is_admin(user_id: int) -> bool:
     Returns:
         True если админ, False если нет
     """
-    from config import ADMIN_IDS
+    from config import ADMIN_IDS_SET
     from database.queries import Database
 
     # Проверяем статических админов из .env
-    if user_id in ADMIN_IDS:
+    if user_id in ADMIN_IDS_SET:
         return True
 
     # Проверяем динамических админов из БД
@@ -3,7 +3,7 @@
 import logging
 from typing import Optional
 
-from config import ADMIN_IDS, ROLE_PERMISSIONS, ROLE_SUPER_ADMIN
+from config import ADMIN_IDS_SET, ROLE_PERMISSIONS, ROLE_SUPER_ADMIN
 from database.repositories.admin_repository import AdminRepository
 
 
@@ -19,7 +19,7 @@ async def has_permission(user_id: int, permission: str) -> bool:
         True если есть разрешение
     """
     # Статические админы (.env) = super_admin
-    if user_id in ADMIN_IDS:
+    if user_id in ADMIN_IDS_SET:
         return ROLE_PERMISSIONS[ROLE_SUPER_ADMIN].get(permission, False)
 
     # Получаем роль из БД
@@ -41,11 +41,25 @@ async def get_admin_role_display(user_id: int) -> str:
     Returns:
         Бейдж роли (👑 или 🛡️)
     """
-    if user_id in ADMIN_IDS:
+    if user_id in ADMIN_IDS_SET:
         return "👑 Super"
 
     role = await AdminRepository.get_admin_role(user_id)
+    return format_role_badge(role)
 
+
+def format_role_badge(role: Optional[str]) -> str:
+    """
+    Бейдж для уже известной роли (без запроса к БД).
+
+    Для списков админов: роль уже есть в строке get_all_admins().
+
+    Args:
+        role: Роль из БД (super_admin, moderator или None)
+
+    Returns:
+        Бейдж роли (👑 или 🛡️)
+    """
     if role == ROLE_SUPER_ADMIN:
         return "👑 Super"
     elif role == "moderator":